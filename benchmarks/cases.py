@@ -0,0 +1,190 @@
+"""
+Benchmarks of the request and response hot path.
+
+Each benchmark is a generator function that performs any setup, yields the
+zero-argument callable to be timed, and then performs any teardown.
+"""
+
+import io
+import json
+
+from flask import request
+from werkzeug.test import encode_multipart
+
+from flask_api import FlaskAPI, parsers, renderers
+from flask_api.mediatypes import MediaType, parse_accept_header
+from flask_api.negotiation import DefaultNegotiation
+
+BENCHMARKS = {}
+
+SIZES = {"small": 10, "medium": 1000, "large": 100000}
+
+BROWSER_ACCEPT = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,"
+    "image/avif,image/webp,*/*;q=0.8"
+)
+
+
+def benchmark(name):
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+def make_items(count):
+    return [
+        {"id": i, "text": "example %d" % i, "done": i % 2 == 0} for i in range(count)
+    ]
+
+
+def make_app():
+    app = FlaskAPI(__name__)
+
+    @app.route("/items/", methods=["GET", "POST"])
+    def items():
+        """
+        A list of example items.
+        """
+        if request.method == "POST":
+            return request.data, 201
+        return make_items(SIZES["small"])
+
+    return app
+
+
+# Media types and Accept headers.
+
+
+@benchmark("mediatype.init")
+def mediatype_init():
+    yield lambda: MediaType("application/json; indent=4; charset=utf-8")
+
+
+@benchmark("mediatype.parse")
+def mediatype_parse():
+    yield lambda: MediaType.parse("application/json; indent=4; charset=utf-8")
+
+
+@benchmark("mediatype.satisfies")
+def mediatype_satisfies():
+    server = MediaType("application/json")
+    client = MediaType("application/*; q=0.9")
+    yield lambda: server.satisfies(client)
+
+
+@benchmark("accept.parse_browser")
+def accept_parse_browser():
+    yield lambda: parse_accept_header(BROWSER_ACCEPT)
+
+
+# Content negotiation.
+
+
+@benchmark("negotiation.select_renderer")
+def negotiation_select_renderer():
+    app = make_app()
+    renderer_list = [renderers.JSONRenderer(), renderers.BrowsableAPIRenderer()]
+    negotiator = DefaultNegotiation()
+    with app.test_request_context("/items/", headers={"Accept": BROWSER_ACCEPT}):
+        yield lambda: negotiator.select_renderer(renderer_list)
+
+
+@benchmark("negotiation.select_parser")
+def negotiation_select_parser():
+    app = make_app()
+    parser_list = [
+        parsers.JSONParser(),
+        parsers.URLEncodedParser(),
+        parsers.MultiPartParser(),
+    ]
+    negotiator = DefaultNegotiation()
+    content_type = "multipart/form-data; boundary=example"
+    with app.test_request_context("/items/", content_type=content_type):
+        yield lambda: negotiator.select_parser(parser_list)
+
+
+# Parsers.
+
+
+def parse_benchmark(parser, body, media_type, **options):
+    media_type = MediaType(media_type)
+    return lambda: parser.parse(io.BytesIO(body), media_type, **options)
+
+
+for size_name, count in SIZES.items():
+
+    @benchmark("parser.json." + size_name)
+    def json_parser(count=count):
+        body = json.dumps(make_items(count)).encode("utf-8")
+        yield parse_benchmark(parsers.JSONParser(), body, "application/json")
+
+    @benchmark("parser.urlencoded." + size_name)
+    def urlencoded_parser(count=count):
+        body = "&".join("field%d=value+%d" % (i, i) for i in range(count))
+        yield parse_benchmark(
+            parsers.URLEncodedParser(),
+            body.encode("ascii"),
+            "application/x-www-form-urlencoded",
+        )
+
+    @benchmark("parser.multipart." + size_name)
+    def multipart_parser(count=count):
+        fields = {"field%d" % i: "value %d" % i for i in range(min(count, 500))}
+        fields["upload"] = (io.BytesIO(b"x" * count * 10), "upload.bin")
+        boundary, body = encode_multipart(fields)
+        with make_app().app_context():
+            yield parse_benchmark(
+                parsers.MultiPartParser(),
+                body,
+                "multipart/form-data; boundary=%s" % boundary,
+                content_length=len(body),
+            )
+
+
+# Renderers.
+
+for size_name, count in SIZES.items():
+
+    @benchmark("renderer.json." + size_name)
+    def json_renderer(count=count):
+        renderer = renderers.JSONRenderer()
+        data = make_items(count)
+        media_type = MediaType("application/json")
+        with make_app().app_context():
+            yield lambda: renderer.render(data, media_type)
+
+
+@benchmark("renderer.browsable_api")
+def browsable_api_renderer():
+    app = make_app()
+    renderer = renderers.BrowsableAPIRenderer()
+    data = make_items(SIZES["small"])
+    media_type = MediaType("text/html")
+    with app.test_request_context("/items/"):
+        response = app.response_class()
+        options = {"status": "200 OK", "status_code": 200, "headers": response.headers}
+        yield lambda: renderer.render(data, media_type, **options)
+
+
+# Round trips through the test client.
+
+
+@benchmark("roundtrip.get_json")
+def roundtrip_get_json():
+    client = make_app().test_client()
+    yield lambda: client.get("/items/")
+
+
+@benchmark("roundtrip.get_html")
+def roundtrip_get_html():
+    client = make_app().test_client()
+    yield lambda: client.get("/items/", headers={"Accept": BROWSER_ACCEPT})
+
+
+@benchmark("roundtrip.post_json")
+def roundtrip_post_json():
+    client = make_app().test_client()
+    body = make_items(SIZES["small"])
+    yield lambda: client.post("/items/", json=body)
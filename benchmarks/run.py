@@ -0,0 +1,144 @@
+"""
+Run the benchmarks, write the results as JSON, and compare them against a
+baseline.
+
+    $ python -m benchmarks.run --output results.json --compare baseline.json
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the `--threshold` fraction.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from importlib import metadata
+
+from benchmarks.cases import BENCHMARKS
+from flask_api import __version__
+
+
+def run_benchmark(case, repeat=5, min_time=0.2):
+    """
+    Time a benchmark case, returning a dict of its fastest and median time
+    per call, in seconds.
+
+    The number of calls per timing is chosen so that each timing takes at
+    least `min_time` seconds.
+    """
+    steps = case()
+    func = next(steps)
+    try:
+        timer = timeit.Timer(func)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= min_time:
+                break
+            number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+        times = [elapsed / number]
+        times.extend(timer.timeit(number) / number for _ in range(repeat - 1))
+    finally:
+        steps.close()
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(names, repeat=5, min_time=0.2, report=print):
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(BENCHMARKS[name], repeat, min_time)
+        report("%-32s %12s" % (name, format_time(results[name]["median"])))
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "flask": metadata.version("flask"),
+        "flask_api": __version__,
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Return a list of (name, baseline time, time, ratio) for each benchmark in
+    both runs, and a list of the names of benchmarks that have regressed.
+    """
+    rows = []
+    regressions = []
+    for name, result in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"]
+        rows.append((name, previous["median"], result["median"], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%.2f%s" % (seconds / scale, unit)
+    return "%.0fns" % (seconds / 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "names", nargs="*", help="Run only benchmarks whose names start with these."
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--compare", help="Compare against the results at this path.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fraction by which a benchmark may be slower than the baseline.",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--list", action="store_true", help="List the benchmarks.")
+    args = parser.parse_args(argv)
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.names or any(name.startswith(prefix) for prefix in args.names)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = run(names, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as baseline_file:
+        baseline = json.load(baseline_file)
+    rows, regressions = compare(results, baseline, args.threshold)
+    print()
+    for name, previous, current, ratio in rows:
+        marker = " <- regression" if name in regressions else ""
+        print(
+            "%-32s %12s %12s %7.2fx%s"
+            % (name, format_time(previous), format_time(current), ratio, marker)
+        )
+    if regressions:
+        print("\n%d benchmark(s) regressed." % len(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,21 @@
 import re
 import sys
+from collections.abc import Iterator
 from itertools import chain
 
-from flask import Blueprint, Flask, request
+from flask import Blueprint, Flask, abort, current_app, request
 from werkzeug.exceptions import HTTPException
 
+from flask_api.asgi import ASGIApp
 from flask_api.compat import is_flask_legacy
-from flask_api.exceptions import APIException
+from flask_api.exceptions import APIException, NotAcceptable
+from flask_api.mediatypes import MediaType
+from flask_api.metrics import CONTENT_TYPE, get_metrics
 from flask_api.request import APIRequest
 from flask_api.response import APIResponse
 from flask_api.settings import APISettings
 from flask_api.status import HTTP_204_NO_CONTENT
+from flask_api.timing import RequestTimings, get_timing_histograms, request_timed
 
 api_resources = Blueprint(
     "flask-api",
@@ -21,6 +26,18 @@ api_resources = Blueprint(
 )
 
 
+@api_resources.route("/metrics")
+def metrics():
+    """
+    Serve the app's metrics in the Prometheus text exposition format, if
+    `METRICS_ENABLED` is set.
+    """
+    if request.metrics is None:
+        abort(404)
+    content = request.metrics.exposition(current_app)
+    return current_app.response_class(content, content_type=CONTENT_TYPE)
+
+
 def urlize_quoted_links(content):
     return re.sub(r'"(https?://[^"]*)"', r'"<a href="\1">\1</a>"', content)
 
@@ -32,14 +49,77 @@ class FlaskAPI(Flask):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.api_settings = APISettings(self.config)
+        self._api_settings_validated = False
         self.register_blueprint(api_resources)
         self.jinja_env.filters["urlize_quoted_links"] = urlize_quoted_links
 
+    def app_context(self):
+        self.validate_api_settings()
+        return super().app_context()
+
+    def request_context(self, environ):
+        self.validate_api_settings()
+        return super().request_context(environ)
+
+    def validate_api_settings(self):
+        """
+        Validate the API settings when the first app or request context is
+        created, so that a bad import string fails before any request is
+        handled, rather than when the setting is first used.
+        """
+        if not self._api_settings_validated:
+            self.api_settings.validate()
+            self._api_settings_validated = True
+
+    def as_asgi(self, executor=None):
+        """
+        Return an ASGI application that serves this app, for running under
+        an ASGI server such as uvicorn or hypercorn.
+        """
+        return ASGIApp(self, executor=executor)
+
     def preprocess_request(self):
-        request.parser_classes = self.api_settings.DEFAULT_PARSERS
-        request.renderer_classes = self.api_settings.DEFAULT_RENDERERS
+        if self.api_settings.TIMING_ENABLED:
+            request.timings = RequestTimings()
+        request.metrics = get_metrics()
+        view_func = None
+        if request.url_rule is not None:
+            view_func = self.view_functions.get(request.url_rule.endpoint)
+        request.parser_classes = getattr(
+            view_func, "parser_classes", self.api_settings.DEFAULT_PARSERS
+        )
+        request.renderer_classes = getattr(
+            view_func, "renderer_classes", self.api_settings.DEFAULT_RENDERERS
+        )
         return super().preprocess_request()
 
+    def dispatch_request(self):
+        timings = request.timings
+        if timings is None:
+            return super().dispatch_request()
+        return timings.measure("view", super().dispatch_request)
+
+    def process_response(self, response):
+        response = super().process_response(response)
+        timings = request.timings
+        if timings is not None:
+            self.record_timings(response, timings)
+        if request.metrics is not None:
+            request.metrics.observe_request(request, response)
+        return response
+
+    def record_timings(self, response, timings):
+        """
+        Complete the timings of a request, adding them to the endpoint's
+        histograms and sending the `request_timed` signal.  If `TIMING_HEADER`
+        is set, they are also sent to the client in a `Server-Timing` header.
+        """
+        timings.finish()
+        if self.api_settings.TIMING_HEADER:
+            response.headers["Server-Timing"] = timings.get_header()
+        get_timing_histograms().observe(request.endpoint, timings)
+        request_timed.send(self, timings=timings, response=response)
+
     def make_response(self, rv):
         """
         We override this so that we can additionally handle
@@ -59,9 +139,18 @@ class FlaskAPI(Flask):
             headers, status_or_headers = status_or_headers, None
 
         if not isinstance(rv, self.response_class):
-            if isinstance(rv, (str, bytes, bytearray, list, dict)):
+            api_types = (
+                self.response_class.api_return_types
+                + self.response_class.api_streaming_types
+            )
+            # Iterators, such as generators, are streamed as is, as by Flask.
+            if isinstance(rv, (str, bytes, bytearray, Iterator) + api_types):
                 status = status_or_headers
-                rv = self.response_class(rv, headers=headers, status=status)
+                try:
+                    rv = self.response_class(rv, headers=headers, status=status)
+                except APIException as exc:
+                    # Eg. no renderer satisfies the client's Accept header.
+                    return self.handle_api_exception(exc)
                 headers = status_or_headers = None
             else:
                 rv = self.response_class.force_type(rv, request.environ)
@@ -108,6 +197,14 @@ class FlaskAPI(Flask):
         raise e
 
     def handle_api_exception(self, exc):
+        if request.metrics is not None:
+            request.metrics.observe_exception(request, exc)
+        if isinstance(exc, NotAcceptable):
+            # No renderer satisfies the client, so the error is rendered with
+            # the first renderer instead.
+            renderer = request.get_renderers()[0]
+            request._accepted_renderer = renderer
+            request._accepted_media_type = MediaType.parse(renderer.media_type)
         content = {"message": exc.detail}
         status = exc.status_code
         return self.response_class(content, status=status)
@@ -0,0 +1,172 @@
+import asyncio
+import io
+import sys
+
+from werkzeug.exceptions import ClientDisconnected
+
+
+class ASGIInputStream(io.RawIOBase):
+    """
+    A blocking, readable stream over the `http.request` messages of an ASGI
+    connection.  It is read from the thread that runs the WSGI application,
+    and pulls each message from the event loop as it is needed, so the body
+    is never buffered in full.
+    """
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b""
+        self._more_body = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer and self._more_body:
+            self._buffer = self._receive_chunk()
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def _receive_chunk(self):
+        future = asyncio.run_coroutine_threadsafe(self._receive(), self._loop)
+        message = future.result()
+        if message["type"] == "http.disconnect":
+            self._more_body = False
+            raise ClientDisconnected()
+        self._more_body = message.get("more_body", False)
+        return message.get("body", b"")
+
+
+class ASGIApp:
+    """
+    Serve a WSGI application, such as a `FlaskAPI` app, over ASGI.
+
+    Each request is handled in a worker thread.  The request body is read
+    from `receive` as the application consumes `request.stream`, and each
+    chunk of the response is sent through `send` as soon as it is produced,
+    so streamed responses are not buffered.
+    """
+
+    def __init__(self, app, executor=None):
+        self.app = app
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.handle_http(scope, receive, send)
+        else:
+            raise ValueError("Unsupported ASGI scope type '%s'" % scope["type"])
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        stream = ASGIInputStream(receive, loop)
+        environ = self.get_environ(scope, io.BufferedReader(stream))
+        await loop.run_in_executor(self.executor, self.run_wsgi, environ, send, loop)
+
+    def run_wsgi(self, environ, send, loop):
+        """
+        Call the WSGI application, sending the response as it is iterated.
+        This is called in a worker thread.
+        """
+        response_start = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response_start.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_start["status"] = int(status.split(" ", 1)[0])
+            response_start["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ]
+
+        def send_message(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def send_response_start():
+            # Headers are sent with the first chunk of the body, so that
+            # `start_response` may still be called before then.
+            if not response_start.get("sent"):
+                send_message(
+                    {
+                        "type": "http.response.start",
+                        "status": response_start["status"],
+                        "headers": response_start["headers"],
+                    }
+                )
+                response_start["sent"] = True
+
+        iterable = self.app(environ, start_response)
+        try:
+            for chunk in iterable:
+                if chunk:
+                    send_response_start()
+                    send_message(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+            send_response_start()
+            send_message({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+
+    def get_environ(self, scope, stream):
+        """
+        Build a WSGI environ from an ASGI `http` scope.
+        """
+        root_path = scope.get("root_path", "")
+        path = scope["path"]
+        if path.startswith(root_path):
+            path = path[len(root_path) :]
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": root_path.encode("utf8").decode("latin-1"),
+            "PATH_INFO": path.encode("utf8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": "HTTP/%s" % scope.get("http_version", "1.1"),
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": stream,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "asgi.scope": scope,
+        }
+
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE" or name == "CONTENT_LENGTH":
+                key = name
+            else:
+                key = "HTTP_" + name
+            if key in environ:
+                separator = "; " if key == "HTTP_COOKIE" else ","
+                value = environ[key] + separator + value
+            environ[key] = value
+
+        if "CONTENT_LENGTH" not in environ:
+            # The body is terminated by the final `http.request` message.
+            environ["wsgi.input_terminated"] = True
+        return environ
@@ -0,0 +1,139 @@
+import json
+
+from flask import current_app, has_app_context
+from flask.json.provider import DefaultJSONProvider
+
+from flask_api.compat import orjson, ujson
+from flask_api.helpers import get_instance
+from flask_api.settings import get_settings
+
+
+def get_json_backend():
+    """
+    Return the JSON backend instance set by `DEFAULT_JSON_BACKEND`.
+    """
+    return get_instance(get_settings().DEFAULT_JSON_BACKEND)
+
+
+def get_json_provider():
+    """
+    Return the app's JSON provider, or the default provider class if there
+    is no app context.  Both expose `default` and `sort_keys`.
+    """
+    if has_app_context():
+        return current_app.json
+    return DefaultJSONProvider
+
+
+def dumps_with_backend(backend_class, data, indent=None):
+    """
+    Render `data` with the given backend class.  This is a process task for
+    `JSONRenderer`, so it must not rely on an app context.
+    """
+    return get_instance(backend_class).dumps(data, indent=indent)
+
+
+class BaseJSONBackend:
+    """
+    JSON backends are used by `JSONParser` and `JSONRenderer`.
+
+    `loads()` is passed the request body as bytes.  `dumps()` may return
+    either a string or bytes, which are used as the response body directly.
+    """
+
+    stateless = True
+
+    def loads(self, data):
+        msg = '`loads()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+    def dumps(self, data, indent=None):
+        msg = '`dumps()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+
+class StdlibJSONBackend(BaseJSONBackend):
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, data, indent=None):
+        if has_app_context():
+            return current_app.json.dumps(data, ensure_ascii=False, indent=indent)
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            indent=indent,
+            default=DefaultJSONProvider.default,
+            sort_keys=DefaultJSONProvider.sort_keys,
+        )
+
+
+class OrjsonBackend(BaseJSONBackend):
+    """
+    Uses `orjson`, which parses from and renders to bytes.
+
+    orjson only supports an indent of 2, so any other indent is rendered
+    with the standard library instead.
+    """
+
+    def __init__(self):
+        assert orjson is not None, "OrjsonBackend requires the `orjson` package"
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, data, indent=None):
+        if indent not in (None, 2):
+            return get_instance(StdlibJSONBackend).dumps(data, indent=indent)
+
+        provider = get_json_provider()
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_SUBCLASS
+        )
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if provider.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=self._get_default(provider), option=option)
+
+    @staticmethod
+    def _get_default(provider):
+        """
+        Serialize passed-through types the same way as the standard library,
+        falling back to the app's JSON provider.
+        """
+
+        def default(obj):
+            if isinstance(obj, dict):
+                # Eg. MultiDict, which should render its first values.
+                return dict(obj.items())
+            elif isinstance(obj, list):
+                return list(obj)
+            elif isinstance(obj, str):
+                return str(obj)
+            elif isinstance(obj, int):
+                return int(obj)
+            return provider.default(obj)
+
+        return default
+
+
+class UjsonBackend(BaseJSONBackend):
+    def __init__(self):
+        assert ujson is not None, "UjsonBackend requires the `ujson` package"
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, data, indent=None):
+        provider = get_json_provider()
+        return ujson.dumps(
+            data,
+            ensure_ascii=False,
+            indent=indent or 0,
+            sort_keys=provider.sort_keys,
+            default=provider.default,
+        )
@@ -0,0 +1,340 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app, request
+
+from flask_api.compression import select_compressor
+from flask_api.settings import get_settings
+
+CacheEntry = namedtuple("CacheEntry", ["body", "status", "headers", "expires"])
+
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the current app's response cache, using the backend set by
+    `CACHE_BACKEND` with the keyword arguments in `CACHE_OPTIONS`.
+
+    The cache is created on first use, and replaced if its settings are
+    changed.
+    """
+    settings = get_settings()
+    config = (settings.CACHE_BACKEND, settings.CACHE_OPTIONS)
+    extensions = current_app.extensions
+    with _cache_lock:
+        cache = extensions.get("flask_api.response_cache")
+        if cache is None or cache.config != config:
+            backend_cls, options = config
+            cache = ResponseCache(backend_cls(**(options or {})))
+            cache.config = config
+            extensions["flask_api.response_cache"] = cache
+    return cache
+
+
+def get_cache_key(vary=()):
+    """
+    Return the cache key for the current request.  Responses are keyed by
+    host, script root, path, query string, negotiated media type and content
+    encoding, and the values of any request headers listed in `vary`.
+    """
+    settings = get_settings()
+    encoding = None
+    if settings.COMPRESSION_ENABLED:
+        compressor = select_compressor(settings.COMPRESSORS, request.accept_encodings)
+        encoding = None if compressor is None else compressor.encoding
+
+    query = sorted(request.args.items(multi=True))
+    parts = [
+        request.host,
+        request.script_root,
+        request.path,
+        repr(query),
+        str(request.accepted_media_type),
+        encoding,
+    ]
+    parts.extend(request.headers.get(header) for header in vary)
+    return repr(parts)
+
+
+def make_cache_entry(response, timeout):
+    """
+    Return a cache entry for a rendered response, or None if the response
+    may not be cached.  Only complete `200 OK` responses without cookies or
+    a private or `no-store` cache control are cached.
+    """
+    if response.status_code != 200 or response.is_streamed:
+        return None
+    if "Set-Cookie" in response.headers:
+        return None
+    cache_control = response.cache_control
+    if cache_control.private or cache_control.no_store:
+        return None
+
+    headers = [
+        (name, value)
+        for name, value in response.headers.items()
+        if name.lower() not in ("content-length", "date")
+    ]
+    expires = None if timeout is None else time.time() + timeout
+    return CacheEntry(response.get_data(), response.status_code, headers, expires)
+
+
+def make_cached_response(entry):
+    """
+    Return a response for a cache entry, that honours conditional requests.
+    """
+    response = current_app.response_class(
+        entry.body, status=entry.status, headers=entry.headers
+    )
+    if "ETag" in response.headers or "Last-Modified" in response.headers:
+        response.make_conditional(request.environ)
+    return response
+
+
+class ResponseCache:
+    """
+    Stores rendered responses in a cache backend.
+
+    Concurrent misses for the same key are coalesced, so that only one
+    thread renders the response while the others wait for it.  If the
+    response may not be cached, the waiting threads then render their own
+    responses concurrently.  This only applies within a process.  Processes
+    that share a file cache may each render a response once.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._counts = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0}
+
+    def get_or_set(self, key, get_entry):
+        """
+        Return the cached entry for `key`.  On a miss, `get_entry()` is
+        called to return a new entry, which is stored unless it is None.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            self._count("hits")
+            return entry
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = threading.Event()
+                waiting = False
+            else:
+                waiting = True
+
+        if waiting:
+            pending.wait()
+            entry = self.backend.get(key)
+            if entry is not None:
+                self._count("coalesced")
+                return entry
+            # The other thread's response could not be cached, so this
+            # thread renders its own, without waiting on any other thread.
+            return self._set(key, get_entry)
+
+        try:
+            return self._set(key, get_entry)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def stats(self):
+        """
+        Return a dict of counts of hits, misses, coalesced misses that were
+        served by another thread's render, and stored entries, along with
+        the backend's entry count and evictions.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+        stats.update(self.backend.stats())
+        return stats
+
+    def clear(self):
+        self.backend.clear()
+
+    def _set(self, key, get_entry):
+        self._count("misses")
+        entry = get_entry()
+        if entry is not None:
+            self.backend.set(key, entry)
+            self._count("stores")
+        return entry
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+
+class BaseCache:
+    """
+    Cache backends store `CacheEntry` tuples by key.  Entries past their
+    `expires` time must not be returned by `get()`.
+    """
+
+    def get(self, key):
+        msg = '`get()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+    def set(self, key, entry):
+        msg = '`set()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+    def clear(self):
+        msg = '`clear()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+    def stats(self):
+        return {}
+
+
+class MemoryCache(BaseCache):
+    """
+    An in-process cache, bounded by its number of entries and the total
+    size of their bodies.  The least recently used entries are evicted.
+    """
+
+    def __init__(self, max_entries=1024, max_size=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires is not None and entry.expires <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if self.max_size is not None and len(entry.body) > self.max_size:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._size += len(entry.body)
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self._size > self.max_size
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self._size,
+                "evictions": self._evictions,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
+
+
+class FileCache(BaseCache):
+    """
+    A cache stored as files in a directory, which may be shared between
+    processes.  Entries are pickled, so the directory must not be writable
+    by untrusted users.  Once there are more than `max_entries` files, the
+    least recently used are removed.
+    """
+
+    def __init__(self, directory, max_entries=1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                stored_key, entry = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+        if entry.expires is not None and entry.expires <= time.time():
+            self._unlink(path)
+            return None
+        # The modification time orders the entries for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key, entry):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump((key, entry), cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._get_path(key))
+        except BaseException:
+            self._unlink(temp_path)
+            raise
+        self._evict()
+
+    def clear(self):
+        for path in self._list_entries():
+            self._unlink(path)
+
+    def stats(self):
+        return {"entries": len(self._list_entries()), "evictions": self._evictions}
+
+    def _get_path(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".cache")
+
+    def _list_entries(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".cache")
+        ]
+
+    def _evict(self):
+        paths = self._list_entries()
+        if len(paths) <= self.max_entries:
+            return
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        mtimes.sort()
+        for mtime, path in mtimes[: len(mtimes) - self.max_entries]:
+            self._unlink(path)
+            self._evictions += 1
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -19,6 +19,48 @@ except ImportError:  # pragma: no cover - markdown installed for tests
     apply_markdown = None
 
 
+# orjson is optional
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# ujson is optional
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+# msgpack is optional
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+# cbor2 is optional
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+
+# brotli is optional
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+# zstandard is optional
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
 def is_flask_legacy():
     v = flask_version.split(".")
     return int(v[0]) == 0 and int(v[1]) < 11
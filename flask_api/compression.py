@@ -0,0 +1,219 @@
+import io
+import zlib
+
+from flask_api import exceptions
+from flask_api.compat import brotli, zstandard
+from flask_api.helpers import get_instance
+
+
+def select_compressor(compressors, accept_encodings):
+    """
+    Return the compressor for the encoding with the highest quality in the
+    client's `Accept-Encoding` header, or None if no encoding is accepted.
+    Equal qualities are resolved by the order of `compressors`.
+    """
+    selected = None
+    selected_quality = 0
+    for compressor_cls in compressors:
+        quality = accept_encodings.quality(compressor_cls.encoding)
+        if quality > selected_quality:
+            selected, selected_quality = compressor_cls, quality
+    return None if selected is None else get_instance(selected)
+
+
+def select_decompressor(compressors, encoding):
+    """
+    Return the compressor that decodes request bodies with the given
+    `Content-Encoding`, or raise `UnsupportedMediaType`.
+    """
+    for compressor_cls in compressors:
+        if compressor_cls.encoding == encoding:
+            compressor = get_instance(compressor_cls)
+            if hasattr(compressor, "decompress_stream"):
+                return compressor
+    msg = "Unsupported Content-Encoding '%s' in request." % encoding
+    raise exceptions.UnsupportedMediaType(msg)
+
+
+class DecompressedStream(io.RawIOBase):
+    """
+    A readable stream that decompresses a request body as it is read.
+    Raises `ParseError` if the body is not validly encoded.
+    """
+
+    def __init__(self, compressor, stream):
+        self._reader = compressor.decompress_stream(stream)
+        self._errors = compressor.decompress_errors
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            data = self._reader.read(len(buffer))
+        except self._errors as exc:
+            msg = "Invalid compressed request body - %s" % exc
+            raise exceptions.ParseError(msg)
+        size = len(data)
+        buffer[:size] = data
+        return size
+
+
+class BaseCompressor:
+    """
+    Compressors encode rendered response content for a `Content-Encoding`.
+
+    `compressobj()` returns an object with `compress(data)` and `finish()`
+    methods, used to compress streaming content.  Each call to `compress()`
+    returns all of the data given so far, so that every chunk of a stream
+    can be decoded by the client as soon as it is received.
+
+    Compressors that can also decode request bodies implement
+    `decompress_stream(stream)`, returning a file-like object whose `read(n)`
+    returns at most `n` bytes of decompressed data.
+    """
+
+    encoding = None
+    stateless = False
+    decompress_errors = ()
+
+    def compress(self, data):
+        stream = self.compressobj()
+        return stream.compress(data) + stream.finish()
+
+    def compressobj(self):
+        msg = '`compressobj()` method must be implemented for class "%s"'
+        raise NotImplementedError(msg % self.__class__.__name__)
+
+    def iter_compress(self, chunks):
+        """
+        Compress an iterable of bytestrings chunk by chunk.
+        """
+        stream = self.compressobj()
+        for chunk in chunks:
+            if chunk:
+                yield stream.compress(chunk)
+        yield stream.finish()
+
+
+class _ZlibStream:
+    def __init__(self, level, wbits):
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        return self._compressobj.compress(data) + self._compressobj.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self):
+        return self._compressobj.flush()
+
+
+class _ZlibReader:
+    def __init__(self, stream, wbits, chunk_size):
+        self._stream = stream
+        self._decompressobj = zlib.decompressobj(wbits)
+        self._chunk_size = chunk_size
+
+    def read(self, size):
+        while not self._decompressobj.eof:
+            # Input left over from the previous read is decompressed first,
+            # so that the output of each read is bounded by `size`.
+            data = self._decompressobj.unconsumed_tail
+            if not data:
+                data = self._stream.read(self._chunk_size)
+                if not data:
+                    raise zlib.error("Compressed data is truncated")
+            output = self._decompressobj.decompress(data, size)
+            if output:
+                return output
+        return b""
+
+
+class GzipCompressor(BaseCompressor):
+    encoding = "gzip"
+    stateless = True
+    level = 6
+    wbits = 16 + zlib.MAX_WBITS
+    chunk_size = 64 * 1024
+    decompress_errors = (zlib.error,)
+
+    def compress(self, data):
+        compressobj = zlib.compressobj(self.level, zlib.DEFLATED, self.wbits)
+        return compressobj.compress(data) + compressobj.flush()
+
+    def compressobj(self):
+        return _ZlibStream(self.level, self.wbits)
+
+    def decompress_stream(self, stream):
+        return _ZlibReader(stream, self.wbits, self.chunk_size)
+
+
+class DeflateCompressor(GzipCompressor):
+    """
+    HTTP's `deflate` encoding is the zlib format, rather than raw deflate.
+    """
+
+    encoding = "deflate"
+    stateless = True
+    wbits = zlib.MAX_WBITS
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class BrotliCompressor(BaseCompressor):
+    encoding = "br"
+    stateless = True
+    quality = 4
+
+    def __init__(self):
+        assert brotli is not None, "BrotliCompressor requires the `brotli` package"
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def compressobj(self):
+        return _BrotliStream(self.quality)
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressobj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressobj.compress(data) + self._compressobj.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self):
+        return self._compressobj.flush()
+
+
+class ZstdCompressor(BaseCompressor):
+    encoding = "zstd"
+    stateless = True
+    level = 3
+    chunk_size = 64 * 1024
+    decompress_errors = (zstandard.ZstdError,) if zstandard is not None else ()
+
+    def __init__(self):
+        assert zstandard is not None, "ZstdCompressor requires the `zstandard` package"
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressobj(self):
+        return _ZstdStream(self.level)
+
+    def decompress_stream(self, stream):
+        decompressor = zstandard.ZstdDecompressor()
+        return decompressor.stream_reader(stream, read_size=self.chunk_size)
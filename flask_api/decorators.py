@@ -1,33 +1,149 @@
-from functools import wraps
+import functools
+import inspect
 
-from flask import request
+from flask import current_app, request
+from werkzeug.http import generate_etag
+
+from flask_api.cache import (
+    get_cache_key,
+    get_response_cache,
+    make_cache_entry,
+    make_cached_response,
+)
+from flask_api.settings import get_settings
+from flask_api.status import HTTP_304_NOT_MODIFIED
 
 
 def set_parsers(*parsers):
+    """
+    Set the parser classes for a view.  The classes are recorded on the view
+    function, and looked up by endpoint before the request is dispatched.
+    They are also set when the view is called, for views that are not looked
+    up by endpoint, such as `MethodView` methods.
+    """
+    if len(parsers) == 1 and isinstance(parsers[0], (list, tuple)):
+        parsers = parsers[0]
+    return _set_request_classes("parser_classes", tuple(parsers))
+
+
+def set_renderers(*renderers):
+    """
+    Set the renderer classes for a view.  The classes are recorded on the view
+    function, and looked up by endpoint before the request is dispatched.
+    They are also set when the view is called, for views that are not looked
+    up by endpoint, such as `MethodView` methods.
+    """
+    if len(renderers) == 1 and isinstance(renderers[0], (list, tuple)):
+        renderers = renderers[0]
+    return _set_request_classes("renderer_classes", tuple(renderers))
+
+
+def _set_request_classes(name, classes):
     def decorator(func):
-        @wraps(func)
-        def decorated_function(*args, **kwargs):
-            if len(parsers) == 1 and isinstance(parsers[0], (list, tuple)):
-                request.parser_classes = parsers[0]
-            else:
-                request.parser_classes = parsers
-            return func(*args, **kwargs)
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                setattr(request, name, classes)
+                return await func(*args, **kwargs)
 
-        return decorated_function
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                setattr(request, name, classes)
+                return func(*args, **kwargs)
+
+        setattr(wrapper, name, classes)
+        return wrapper
 
     return decorator
 
 
-def set_renderers(*renderers):
+def etag(get_etag, weak=False):
+    """
+    Supply a precomputed ETag for a view, such as a version number or a
+    last updated timestamp, so that unchanged responses are not rendered.
+
+    `get_etag` is called with the view's arguments, and may return None
+    if no ETag is available.  The ETag is qualified by the negotiated media
+    type.  If it matches the client's `If-None-Match` header, a
+    `304 Not Modified` response is returned without calling the view.
+    """
+
+    def check_etag(args, kwargs):
+        # Record the view's ETag, returning a 304 response if it matches.
+        value = get_etag(*args, **kwargs)
+        if value is None:
+            return None
+        media_type = str(request.accepted_media_type)
+        tag = generate_etag(("%s;%s" % (value, media_type)).encode("utf-8"))
+        request.response_etag = (tag, weak)
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if not request.if_none_match.contains_weak(tag):
+            return None
+        response = current_app.response_class(status=HTTP_304_NOT_MODIFIED)
+        response.set_etag(tag, weak=weak)
+        return response
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                response = check_etag(args, kwargs)
+                if response is not None:
+                    return response
+                return await func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                response = check_etag(args, kwargs)
+                if response is not None:
+                    return response
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def cache_response(timeout=None, vary=()):
+    """
+    Cache the rendered responses of a view to `GET` and `HEAD` requests.
+
+    Responses are cached for `timeout` seconds, or `CACHE_DEFAULT_TIMEOUT`
+    if it is not given, and are keyed by the path, query string, negotiated
+    media type and content encoding, and the values of the request headers
+    listed in `vary`.
+    """
+
     def decorator(func):
-        @wraps(func)
-        def decorated_function(*args, **kwargs):
-            if len(renderers) == 1 and isinstance(renderers[0], (list, tuple)):
-                request.renderer_classes = renderers[0]
-            else:
-                request.renderer_classes = renderers
-            return func(*args, **kwargs)
-
-        return decorated_function
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return func(*args, **kwargs)
+
+            rendered = []
+
+            def render():
+                rv = current_app.ensure_sync(func)(*args, **kwargs)
+                response = current_app.make_response(rv)
+                rendered.append(response)
+                cache_timeout = timeout
+                if cache_timeout is None:
+                    cache_timeout = get_settings().CACHE_DEFAULT_TIMEOUT
+                return make_cache_entry(response, cache_timeout)
+
+            cache = get_response_cache()
+            entry = cache.get_or_set(get_cache_key(vary), render)
+            if rendered:
+                return rendered[0]
+            return make_cached_response(entry)
+
+        return wrapper
 
     return decorator
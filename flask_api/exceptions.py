@@ -51,6 +51,11 @@ class NotAcceptable(APIException):
     detail = "Could not satisfy the request Accept header."
 
 
+class RequestEntityTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    detail = "Request body exceeds the maximum allowed size."
+
+
 class UnsupportedMediaType(APIException):
     status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
     detail = "Unsupported media type in the request Content-Type header."
@@ -61,6 +66,11 @@ class Throttled(APIException):
     detail = "Request was throttled."
 
 
+class ServiceUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Service temporarily unavailable."
+
+
 #     def __init__(self, wait=None, detail=None):
 #         if wait is None:
 #             self.detail = detail or self.detail
@@ -0,0 +1,183 @@
+import contextvars
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from flask import current_app, has_app_context
+
+from flask_api import exceptions
+from flask_api.settings import get_settings
+
+_executor_lock = threading.Lock()
+
+
+def get_render_executor():
+    """
+    Return the current app's render executor, as set by `RENDER_EXECUTOR`,
+    or None if rendering is not offloaded.
+
+    The executor is created on first use, and replaced if its settings
+    are changed.
+    """
+    if not has_app_context():
+        return None
+    settings = get_settings()
+    if settings.RENDER_EXECUTOR is None:
+        return None
+
+    config = (
+        settings.RENDER_EXECUTOR,
+        settings.RENDER_EXECUTOR_WORKERS,
+        settings.RENDER_TIMEOUT,
+        settings.RENDER_FALLBACK,
+    )
+    extensions = current_app.extensions
+    with _executor_lock:
+        executor = extensions.get("flask_api.render_executor")
+        if executor is None or executor.config != config:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = RenderExecutor(*config)
+            extensions["flask_api.render_executor"] = executor
+    return executor
+
+
+def count_items(data, limit):
+    """
+    Count the values in a payload of nested lists and dicts.
+
+    Counting stops once the count exceeds `limit`, so the cost is bounded
+    by the limit rather than the size of the payload.
+    """
+    count = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            values = value.values()
+        elif isinstance(value, (list, tuple)):
+            values = value
+        else:
+            continue
+        count += len(values)
+        if count > limit:
+            break
+        stack.extend(itertools.islice(values, limit - count + 1))
+    return count
+
+
+class RenderExecutor:
+    """
+    Renders responses in a pool of worker threads or processes.
+
+    Thread pools suit backends that release the GIL, and renderers that
+    need the request context, such as the browsable API.  Process pools
+    avoid the GIL entirely, but only render with renderers that provide a
+    process task.  Other renderers are called inline.
+    """
+
+    def __init__(
+        self, kind="thread", max_workers=None, timeout=None, fallback="inline"
+    ):
+        assert kind in ("thread", "process"), "Unknown render executor '%s'" % kind
+        assert fallback in ("inline", "error"), (
+            "Unknown render fallback '%s'" % fallback
+        )
+        self.config = (kind, max_workers, timeout, fallback)
+        self.kind = kind
+        self.timeout = timeout
+        self.fallback = fallback
+        if kind == "process":
+            self.pool = ProcessPoolExecutor(max_workers)
+        else:
+            self.pool = ThreadPoolExecutor(max_workers, "flask-api-render")
+        self.max_workers = self.pool._max_workers
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counts = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "fallbacks": 0,
+            "inline": 0,
+        }
+
+    def render(self, renderer, data, media_type, **options):
+        """
+        Render `data` in the pool, waiting up to `timeout` seconds.
+        """
+        if self.kind == "process":
+            task = renderer.get_process_task(data, media_type, **options)
+            if task is None:
+                self._count("inline")
+                return renderer.render(data, media_type, **options)
+            func, args = task
+            kwargs = {}
+        else:
+            # Copy the context, so that the request is available to the renderer.
+            func = contextvars.copy_context().run
+            args = (renderer.render, data, media_type)
+            kwargs = options
+
+        try:
+            future = self.pool.submit(func, *args, **kwargs)
+        except RuntimeError:
+            # The pool has been shut down, or a worker process has died.
+            return self._fallback(renderer, data, media_type, options)
+
+        with self._lock:
+            self._pending += 1
+            self._counts["submitted"] += 1
+        future.add_done_callback(self._done)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._count("timeouts")
+            if self.fallback == "error":
+                raise exceptions.ServiceUnavailable("Rendering the response timed out.")
+            return self._fallback(renderer, data, media_type, options)
+        except Exception:
+            if self.kind == "thread":
+                raise
+            # The payload could not be sent to a worker process.  Render it
+            # inline, which reraises if rendering itself failed.
+            return self._fallback(renderer, data, media_type, options)
+
+    def stats(self):
+        """
+        Return a dict of the pool's size, the number of pending renders,
+        and counts of submitted, completed, failed, timed out, fallback and
+        inline renders.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            stats.update(
+                kind=self.kind,
+                max_workers=self.max_workers,
+                pending=self._pending,
+                utilization=min(self._pending, self.max_workers) / self.max_workers,
+            )
+        return stats
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+    def _fallback(self, renderer, data, media_type, options):
+        self._count("fallbacks")
+        return renderer.render(data, media_type, **options)
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _done(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._counts["failed"] += 1
+            else:
+                self._counts["completed"] += 1
@@ -1,5 +1,323 @@
-def url_decode_stream(stream):
-    import urllib
-    body = stream.read()
-    body_str = body.decode()
-    return dict(urllib.parse.parse_qsl(body_str))
+import asyncio
+import codecs
+import contextvars
+import functools
+import io
+import re
+import sys
+import threading
+from urllib.parse import unquote_to_bytes
+
+from werkzeug.datastructures import MultiDict
+
+from flask_api import exceptions
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """
+    Call `func` in the event loop's default thread pool and await the result.
+
+    The current context is copied into the worker thread, so that the
+    request and application contexts remain available to `func`.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(None, call)
+
+
+def url_decode_stream(
+    stream, charset="utf-8", max_fields=None, max_field_size=None, chunk_size=64 * 1024
+):
+    """
+    Decode a url encoded form from a stream into a `MultiDict`, reading it
+    in chunks.  Repeated keys are preserved.
+
+    Raises `RequestEntityTooLarge` if there are more than `max_fields` fields,
+    or if any field is longer than `max_field_size` bytes.
+    """
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        raise exceptions.ParseError("Unknown charset '%s'" % charset)
+
+    items = []
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        fields = buffer.split(b"&")
+        buffer = fields.pop() if chunk else bytearray()
+        for field in fields:
+            if max_field_size is not None and len(field) > max_field_size:
+                raise exceptions.RequestEntityTooLarge("Form field exceeds maximum size.")
+            if field:
+                items.append(_url_decode_field(field, charset))
+        if max_fields is not None and len(items) > max_fields:
+            raise exceptions.RequestEntityTooLarge("Form exceeds maximum number of fields.")
+        if max_field_size is not None and len(buffer) > max_field_size:
+            raise exceptions.RequestEntityTooLarge("Form field exceeds maximum size.")
+        if not chunk:
+            return MultiDict(items)
+
+
+def _url_decode_field(field, charset):
+    key, sep, value = field.replace(b"+", b" ").partition(b"=")
+    key = unquote_to_bytes(bytes(key)).decode(charset, "replace")
+    value = unquote_to_bytes(bytes(value)).decode(charset, "replace")
+    return (key, value)
+
+
+class ParsedFormStream(io.BytesIO):
+    """
+    A url encoded request body that has already been parsed, so that
+    `URLEncodedParser` can reuse the parsed form rather than decode it again.
+    """
+
+    def __init__(self, body, parsed_form):
+        super().__init__(body)
+        self.parsed_form = parsed_form
+
+
+class LimitedStream(io.RawIOBase):
+    """
+    A readable stream over a request body of unknown length, that raises
+    `RequestEntityTooLarge` once more than `max_size` bytes have been read.
+    """
+
+    def __init__(self, stream, max_size, message=None):
+        self._stream = stream
+        self._max_size = max_size
+        self._message = message
+        self._size = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        size = len(data)
+        self._size += size
+        if self._size > self._max_size:
+            raise exceptions.RequestEntityTooLarge(self._message)
+        buffer[:size] = data
+        return size
+
+
+_shared_instances = {}
+_shared_instances_lock = threading.Lock()
+
+
+def get_instance(cls):
+    """
+    Return an instance of a parser or renderer class.
+
+    Classes that set `stateless = True` are instantiated once per process,
+    and the instance is shared between requests and threads.  Any other
+    class is instantiated afresh on each call.  The flag is not inherited,
+    so that a subclass which keeps state on the instance is not shared.
+    """
+    if not cls.__dict__.get("stateless", False):
+        return cls()
+    try:
+        return _shared_instances[cls]
+    except KeyError:
+        with _shared_instances_lock:
+            if cls not in _shared_instances:
+                _shared_instances[cls] = cls()
+            return _shared_instances[cls]
+
+
+class JSONScanner:
+    """
+    Incrementally scans the structure of a JSON document, without decoding it.
+
+    Enforces a maximum nesting depth, and reports the offsets of the commas
+    and closing bracket that delimit the items of a top-level array.
+    """
+
+    structure_re = re.compile(rb'["\[\]{},]')
+    string_re = re.compile(rb'["\\]')
+
+    def __init__(self, max_depth=None):
+        self.max_depth = max_depth
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def scan(self, data, pos=0):
+        """
+        Scan `data` from `pos`, carrying state over from any previous call.
+        Returns a list of offsets of the top-level item delimiters.
+        """
+        delimiters = []
+        end = len(data)
+        while pos < end:
+            if self.escaped:
+                self.escaped = False
+                pos += 1
+            elif self.in_string:
+                match = self.string_re.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if data[match.start()] == 0x5C:  # backslash
+                    self.escaped = True
+                else:
+                    self.in_string = False
+            else:
+                match = self.structure_re.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                char = data[match.start()]
+                if char == 0x22:  # '"'
+                    self.in_string = True
+                elif char in (0x5B, 0x7B):  # '[' or '{'
+                    self.depth += 1
+                    if self.max_depth is not None and self.depth > self.max_depth:
+                        msg = "JSON parse error - Maximum nesting depth exceeded"
+                        raise exceptions.ParseError(msg)
+                elif char in (0x5D, 0x7D):  # ']' or '}'
+                    self.depth -= 1
+                    if self.depth == 0:
+                        delimiters.append(match.start())
+                elif self.depth == 1:  # ','
+                    delimiters.append(match.start())
+        return delimiters
+
+
+class LazyJSONObject(dict):
+    """
+    A dict of the top-level members of a JSON object, that only decodes the
+    value of each member when it is accessed.
+
+    The members are located when the object is created, without decoding
+    their values.  Any operation that needs every value decodes the rest of
+    the members, after which `materialized` is `True`.
+    """
+
+    member_re = re.compile(rb'\s*("(?:[^"\\]|\\.)*")\s*:', re.DOTALL)
+
+    def __init__(self, body, loads):
+        super().__init__()
+        self.materialized = False
+        self._body = body
+        self._loads = loads
+
+        scanner = JSONScanner()
+        delimiters = scanner.scan(body)
+        start = body.index(b"{") + 1
+        members = []
+        valid = scanner.depth == 0 and bool(delimiters)
+        for delimiter in delimiters:
+            member = self.member_re.match(body, start, delimiter)
+            if member is None:
+                # Only an empty object may contain no members.
+                valid = valid and not members and not body[start:delimiter].strip()
+                valid = valid and delimiter == delimiters[-1]
+                break
+            members.append((member.group(1), _Span(member.end(), delimiter)))
+            start = delimiter + 1
+        valid = valid and not body[delimiters[-1] + 1 :].strip()
+
+        if not valid:
+            # Not a well-formed object, so decode it in full to report the error.
+            self._decode(body)
+            raise exceptions.ParseError("JSON parse error - Expected an object")
+
+        for key, span in members:
+            super().__setitem__(self._decode(key), span)
+
+    def _decode(self, data):
+        try:
+            return self._loads(bytes(data))
+        except ValueError as exc:
+            msg = "JSON parse error - %s" % str(exc)
+            raise exceptions.ParseError(msg)
+
+    def _materialize(self):
+        if self.materialized:
+            return
+        for key in super().keys():
+            self[key]
+        self.materialized = True
+        self._body = None
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, _Span):
+            value = self._decode(self._body[value.start : value.end])
+            super().__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # Overridden so that `dict(obj)` and `{**obj}` use `__getitem__`,
+        # rather than copying the undecoded values.
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        self._materialize()
+        return super().values()
+
+    def items(self):
+        self._materialize()
+        return super().items()
+
+    def __eq__(self, other):
+        self._materialize()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        self._materialize()
+        return super().__ne__(other)
+
+    def __repr__(self):
+        self._materialize()
+        return super().__repr__()
+
+    def copy(self):
+        self._materialize()
+        return dict(self)
+
+    if sys.version_info >= (3, 9):
+
+        def __or__(self, other):
+            self._materialize()
+            return super().__or__(other)
+
+        def __ror__(self, other):
+            self._materialize()
+            return super().__ror__(other)
+
+    def __reduce__(self):
+        # Copied and pickled as a plain dict of the decoded values.
+        return (dict, (self.copy(),))
+
+    def pop(self, key, *args):
+        if key in self:
+            self[key]
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._materialize()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        return super().setdefault(key, default)
+
+
+class _Span:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
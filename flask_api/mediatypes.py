@@ -1,13 +1,60 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+
 class MediaType:
+    """
+    An immutable, hashable media type.
+
+    Everything that depends only on the media type string is computed once
+    on construction.  Use `MediaType.parse()` to share instances between
+    requests that send the same header values.
+    """
+
+    __slots__ = (
+        "main_type",
+        "sub_type",
+        "params",
+        "full_type",
+        "precedence",
+        "_str",
+        "_hash",
+    )
+
     def __init__(self, media_type):
-        self.main_type, self.sub_type, self.params = self._parse(media_type)
+        main_type, sub_type, params = self._parse(media_type)
+        full_type = main_type + "/" + sub_type
+        if params:
+            params_str = ", ".join(
+                ['%s="%s"' % (key, val) for key, val in sorted(params.items())]
+            )
+            canonical = full_type + "; " + params_str
+        else:
+            canonical = full_type
+
+        init = object.__setattr__
+        init(self, "main_type", main_type)
+        init(self, "sub_type", sub_type)
+        init(self, "params", MappingProxyType(params))
+        init(self, "full_type", full_type)
+        init(self, "precedence", self._get_precedence(main_type, sub_type, params))
+        init(self, "_str", canonical)
+        init(self, "_hash", hash(canonical))
+
+    @classmethod
+    def parse(cls, media_type):
+        """
+        Return a `MediaType` for the given string, reusing a cached instance
+        if the same string has been parsed before.
 
-    @property
-    def full_type(self):
-        return self.main_type + "/" + self.sub_type
+        Only use this for strings from a small set, such as server media
+        types and Accept header tokens, and not for a request's Content-Type,
+        which may carry a unique multipart boundary.
+        """
+        return _parse_cached(cls, media_type)
 
-    @property
-    def precedence(self):
+    @staticmethod
+    def _get_precedence(main_type, sub_type, params):
         """
         Precedence is determined by how specific a media type is:
 
@@ -16,11 +63,11 @@ class MediaType:
         1. 'type/*'
         0. '*/*'
         """
-        if self.main_type == "*":
+        if main_type == "*":
             return 0
-        elif self.sub_type == "*":
+        elif sub_type == "*":
             return 1
-        elif not self.params or list(self.params.keys()) == ["q"]:
+        elif not params or list(params.keys()) == ["q"]:
             return 2
         return 3
 
@@ -78,20 +125,31 @@ class MediaType:
         Return a canonical string representing the media type.
         Note that this ensures the params are sorted.
         """
-        if self.params:
-            params_str = ", ".join(
-                ['%s="%s"' % (key, val) for key, val in sorted(self.params.items())]
-            )
-            return self.full_type + "; " + params_str
-        return self.full_type
+        return self._str
 
     def __hash__(self):
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other):
         # Compare two MediaType instances, ignoring parameter ordering.
+        if not isinstance(other, MediaType):
+            return NotImplemented
         return self.full_type == other.full_type and self.params == other.params
 
+    def __setattr__(self, name, value):
+        raise AttributeError("MediaType instances are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("MediaType instances are immutable")
+
+    def __reduce__(self):
+        return (self.__class__, (self._str,))
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(cls, media_type):
+    return cls(media_type)
+
 
 def parse_accept_header(accept):
     """
@@ -107,6 +165,6 @@ def parse_accept_header(accept):
     """
     ret = [set(), set(), set(), set()]
     for token in accept.split(","):
-        media_type = MediaType(token.strip())
+        media_type = MediaType.parse(token.strip())
         ret[3 - media_type.precedence].add(media_type)
     return [media_types for media_types in ret if media_types]
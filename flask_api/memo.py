@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+from flask_api.settings import get_settings
+
+_memo_lock = threading.Lock()
+
+
+def get_render_memo():
+    """
+    Return the current app's memo of rendered `FrozenPayload` content,
+    bounded by `RENDER_MEMO_MAX_SIZE`, or None if it is disabled.
+    """
+    max_size = get_settings().RENDER_MEMO_MAX_SIZE
+    if not max_size:
+        return None
+    extensions = current_app.extensions
+    with _memo_lock:
+        memo = extensions.get("flask_api.render_memo")
+        if memo is None or memo.max_size != max_size:
+            memo = RenderMemo(max_size)
+            extensions["flask_api.render_memo"] = memo
+    return memo
+
+
+class RenderMemo:
+    """
+    A size-bounded memo of rendered content, keyed by the identity and
+    version of the data, the renderer, the media type and the indent.
+    The least recently used content is evicted once the total size of the
+    memoized content exceeds `max_size` characters or bytes.
+
+    Each entry holds a reference to its data, so that the identity of the
+    data cannot be reused by another object while the entry exists.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_key(self, payload, renderer, media_type, **options):
+        return (
+            id(payload.data),
+            payload.get_version(),
+            type(renderer),
+            str(media_type),
+            options.get("indent"),
+        )
+
+    def get(self, key, data):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not data:
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+            return entry[1]
+
+    def set(self, key, data, content):
+        size = len(content)
+        if size > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (data, content)
+            self._size += size
+            while self._size > self.max_size:
+                key, (data, content) = self._entries.popitem(last=False)
+                self._size -= len(content)
+                self._counts["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return a dict of counts of hits, misses and evictions, along with
+        the number of entries and their total size.
+        """
+        with self._lock:
+            stats = dict(self._counts)
+            stats.update(entries=len(self._entries), size=self._size)
+        return stats
@@ -0,0 +1,315 @@
+import threading
+
+from flask import current_app
+from werkzeug.wsgi import get_content_length
+
+from flask_api.settings import get_settings
+from flask_api.timing import Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_metrics_lock = threading.Lock()
+
+# Extensions whose `stats()` are exported as gauges, if they have been created.
+stats_extensions = (
+    ("flask_api.render_executor", "flask_api_render_executor"),
+    ("flask_api.response_cache", "flask_api_response_cache"),
+    ("flask_api.render_memo", "flask_api_render_memo"),
+)
+
+
+def get_metrics():
+    """
+    Return the current app's metrics, with the size buckets set by
+    `METRICS_SIZE_BUCKETS`, or None if `METRICS_ENABLED` is not set.
+    """
+    settings = get_settings()
+    if not settings.METRICS_ENABLED:
+        return None
+    size_buckets = settings.METRICS_SIZE_BUCKETS
+    extensions = current_app.extensions
+    # The lock is only taken to create or replace the metrics.
+    metrics = extensions.get("flask_api.metrics")
+    if metrics is not None and metrics.size_buckets == size_buckets:
+        return metrics
+    with _metrics_lock:
+        metrics = extensions.get("flask_api.metrics")
+        if metrics is None or metrics.size_buckets != size_buckets:
+            metrics = APIMetrics(size_buckets)
+            extensions["flask_api.metrics"] = metrics
+    return metrics
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    items = []
+    for name, value in labels:
+        value = str(value).replace("\\", r"\\").replace('"', r"\"")
+        items.append('%s="%s"' % (name, value.replace("\n", r"\n")))
+    return "{%s}" % ",".join(items)
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Shard:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.values = {}
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        values = self.registry.get_shard().values
+        key = (self.name, labelvalues)
+        values[key] = values.get(key, 0) + amount
+
+    def exposition(self, labels, value):
+        yield "%s%s %s" % (self.name, format_labels(labels), format_value(value))
+
+
+class HistogramMetric(Metric):
+    type = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=()):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labelvalues):
+        values = self.registry.get_shard().values
+        key = (self.name, labelvalues)
+        histogram = values.get(key)
+        if histogram is None:
+            histogram = values[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def exposition(self, labels, histogram):
+        cumulative = 0
+        bounds = histogram.buckets + (float("inf"),)
+        for bound, count in zip(bounds, histogram.counts):
+            cumulative += count
+            bucket_labels = labels + (("le", format_value(float(bound))),)
+            yield "%s_bucket%s %d" % (
+                self.name,
+                format_labels(bucket_labels),
+                cumulative,
+            )
+        yield "%s_sum%s %s" % (self.name, format_labels(labels), repr(histogram.sum))
+        yield "%s_count%s %d" % (self.name, format_labels(labels), histogram.count)
+
+
+class MetricsRegistry:
+    """
+    A registry of counters and histograms.
+
+    Each thread records its observations in its own shard, without taking a
+    lock, so that workers are never serialized by recording metrics.  The
+    shards are only combined when the metrics are collected.  Shards of
+    threads that have exited are folded into a single retired shard, so that
+    servers which start a thread per request do not accumulate shards.
+
+    A collection that runs concurrently with an observation may see a
+    histogram's count without its sum, or vice versa, until the next
+    collection.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=()):
+        metric = HistogramMetric(self, name, documentation, labelnames, buckets)
+        return self.register(metric)
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def get_shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def collect(self):
+        """
+        Return a dict of the combined value of every metric, keyed by
+        (name, labelvalues).  Counter values are numbers, and histogram
+        values are `Histogram` instances.
+        """
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._merge(self._retired, shard.values)
+            self._shards = live
+            totals = {}
+            self._merge(totals, self._retired)
+            for shard in live:
+                self._merge(totals, shard.values.copy())
+        return totals
+
+    def exposition(self):
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        values = self.collect()
+        lines = []
+        for metric in self.metrics.values():
+            lines.append("# HELP %s %s" % (metric.name, metric.documentation))
+            lines.append("# TYPE %s %s" % (metric.name, metric.type))
+            for (name, labelvalues), value in sorted(
+                values.items(), key=lambda item: item[0]
+            ):
+                if name == metric.name:
+                    labels = tuple(zip(metric.labelnames, labelvalues))
+                    lines.extend(metric.exposition(labels, value))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _merge(target, values):
+        for key, value in values.items():
+            if isinstance(value, Histogram):
+                total = target.get(key)
+                if total is None:
+                    total = target[key] = Histogram(value.buckets)
+                # Copy the counts first, as they may be updated concurrently.
+                for index, count in enumerate(list(value.counts)):
+                    total.counts[index] += count
+                total.sum += value.sum
+                total.count += value.count
+            else:
+                target[key] = target.get(key, 0) + value
+
+
+class APIMetrics(MetricsRegistry):
+    """
+    The metrics recorded for each request to a Flask API app.
+    """
+
+    def __init__(self, size_buckets):
+        super().__init__()
+        self.size_buckets = size_buckets
+        self.requests = self.counter(
+            "flask_api_requests_total",
+            "Requests handled, by endpoint, method and status.",
+            ("endpoint", "method", "status"),
+        )
+        self.renderers = self.counter(
+            "flask_api_renderer_selected_total",
+            "Responses rendered, by endpoint and negotiated renderer.",
+            ("endpoint", "renderer"),
+        )
+        self.parsers = self.counter(
+            "flask_api_parser_selected_total",
+            "Request bodies parsed, by endpoint and selected parser.",
+            ("endpoint", "parser"),
+        )
+        self.exceptions = self.counter(
+            "flask_api_exceptions_total",
+            "API exceptions handled, by endpoint and exception class.",
+            ("endpoint", "exception"),
+        )
+        self.request_size = self.histogram(
+            "flask_api_request_size_bytes",
+            "Request body sizes, by endpoint.",
+            ("endpoint",),
+            size_buckets,
+        )
+        self.response_size = self.histogram(
+            "flask_api_response_size_bytes",
+            "Response body sizes, by endpoint.",
+            ("endpoint",),
+            size_buckets,
+        )
+
+    def observe_request(self, request, response):
+        endpoint = request.endpoint or ""
+        self.requests.inc(endpoint, request.method, str(response.status_code))
+        renderer = getattr(request, "_accepted_renderer", None)
+        if renderer is not None:
+            self.renderers.inc(endpoint, type(renderer).__name__)
+        if request.accepted_parser is not None:
+            self.parsers.inc(endpoint, type(request.accepted_parser).__name__)
+        # The size on the wire, as `content_length` is None for bodies that
+        # are decompressed.
+        content_length = get_content_length(request.environ)
+        if content_length is not None:
+            self.request_size.observe(content_length, endpoint)
+        if response.content_length is not None:
+            self.response_size.observe(response.content_length, endpoint)
+
+    def observe_exception(self, request, exc):
+        self.exceptions.inc(request.endpoint or "", type(exc).__name__)
+
+    def exposition(self, app=None):
+        """
+        Return the metrics in the Prometheus text exposition format, along
+        with the request phase timings and the stats of the render executor,
+        response cache and render memo of the given app.
+        """
+        lines = [super().exposition()]
+        if app is not None:
+            histograms = app.extensions.get("flask_api.timings")
+            if histograms is not None:
+                lines.extend(self._timing_exposition(histograms))
+            for extension, prefix in stats_extensions:
+                if app.extensions.get(extension) is not None:
+                    lines.extend(self._stats_exposition(app, extension, prefix))
+        return "".join(lines)
+
+    def _timing_exposition(self, histograms):
+        name = "flask_api_request_phase_seconds"
+        metric = HistogramMetric(
+            self, name, "Time spent in each phase of a request, by endpoint."
+        )
+        yield "# HELP %s %s\n" % (name, metric.documentation)
+        yield "# TYPE %s histogram\n" % name
+        snapshots = sorted(
+            ((endpoint or "", phase), snapshot)
+            for (endpoint, phase), snapshot in histograms.snapshot().items()
+        )
+        for (endpoint, phase), snapshot in snapshots:
+            histogram = Histogram(snapshot["buckets"])
+            histogram.counts = snapshot["counts"]
+            histogram.sum = snapshot["sum"]
+            histogram.count = snapshot["count"]
+            labels = (("endpoint", endpoint), ("phase", phase))
+            for line in metric.exposition(labels, histogram):
+                yield line + "\n"
+
+    def _stats_exposition(self, app, extension, prefix):
+        stats = app.extensions[extension].stats()
+        for key, value in sorted(stats.items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            yield "# TYPE %s_%s gauge\n" % (prefix, key)
+            yield "%s_%s %s\n" % (prefix, key, format_value(value))
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from flask import request
 
 from flask_api import exceptions
@@ -22,9 +24,10 @@ class DefaultNegotiation(BaseNegotiation):
         """
         content_type_header = request.content_type
 
+        # Not cached, as eg each multipart request sends a unique boundary.
         client_media_type = MediaType(content_type_header)
         for parser in parsers:
-            server_media_type = MediaType(parser.media_type)
+            server_media_type = MediaType.parse(parser.media_type)
             if server_media_type.satisfies(client_media_type):
                 return (parser, client_media_type)
 
@@ -36,15 +39,50 @@ class DefaultNegotiation(BaseNegotiation):
         Returns a two-tuple of (renderer, content type).
         """
         accept_header = request.headers.get("Accept", "*/*")
+        media_types = tuple(renderer.media_type for renderer in renderers)
+
+        index, media_type = _select_renderer(media_types, accept_header)
+        if index is None:
+            raise exceptions.NotAcceptable()
+        return (renderers[index], media_type)
+
+    @staticmethod
+    def renderer_cache_info():
+        """
+        Return the hit/miss statistics for the renderer selection cache.
+        """
+        return _select_renderer.cache_info()
+
+    @staticmethod
+    def renderer_cache_clear():
+        _select_renderer.cache_clear()
+        _compile_media_types.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _compile_media_types(media_types):
+    """
+    Parse a tuple of renderer media type strings once, rather than per request.
+    """
+    return tuple(MediaType.parse(media_type) for media_type in media_types)
+
+
+@lru_cache(maxsize=512)
+def _select_renderer(media_types, accept_header):
+    """
+    Returns a two-tuple of (renderer index, content type), or `(None, None)`
+    if none of the renderers satisfy the accept header.
 
-        for client_media_types in parse_accept_header(accept_header):
-            for renderer in renderers:
-                server_media_type = MediaType(renderer.media_type)
-                for client_media_type in client_media_types:
-                    if client_media_type.satisfies(server_media_type):
-                        if server_media_type.precedence > client_media_type.precedence:
-                            return (renderer, server_media_type)
-                        else:
-                            return (renderer, client_media_type)
-
-        raise exceptions.NotAcceptable()
+    Results are cached, as clients only send a small number of distinct
+    accept headers, and each renderer list is fixed per view.
+    """
+    server_media_types = _compile_media_types(media_types)
+    for client_media_types in parse_accept_header(accept_header):
+        for index, server_media_type in enumerate(server_media_types):
+            for client_media_type in client_media_types:
+                if client_media_type.satisfies(server_media_type):
+                    if server_media_type.precedence > client_media_type.precedence:
+                        return (index, server_media_type)
+                    else:
+                        return (index, client_media_type)
+    return (None, None)
@@ -1,14 +1,24 @@
-import json
+from tempfile import SpooledTemporaryFile
 
+from werkzeug.exceptions import RequestEntityTooLarge as WerkzeugRequestEntityTooLarge
 from werkzeug.formparser import MultiPartParser as WerkzeugMultiPartParser
-from werkzeug.formparser import default_stream_factory
 
-from flask_api.helpers import url_decode_stream
+from flask_api.backends import get_json_backend
+from flask_api.compat import cbor2, msgpack
+from flask_api.helpers import (
+    JSONScanner,
+    LazyJSONObject,
+    LimitedStream,
+    url_decode_stream,
+)
+from flask_api.mediatypes import MediaType
+from flask_api.settings import get_settings
 from flask_api import exceptions
 
 
 class BaseParser:
     media_type = None
+    stateless = False  # If set then a single instance is shared between requests.
     handles_file_uploads = False  # If set then 'request.files' will be populated.
     handles_form_data = False  # If set then 'request.form' will be populated.
 
@@ -19,18 +29,198 @@ class BaseParser:
 
 class JSONParser(BaseParser):
     media_type = "application/json"
+    stateless = True
+    chunk_size = 64 * 1024
 
     def parse(self, stream, media_type, **options):
-        data = stream.read().decode("utf-8")
+        backend = get_json_backend()
+        body = self.read_body(stream, **options)
         try:
-            return json.loads(data)
+            return backend.loads(body)
         except ValueError as exc:
             msg = "JSON parse error - %s" % str(exc)
             raise exceptions.ParseError(msg)
 
+    def parse_lazy(self, stream, media_type, **options):
+        """
+        Read the request body, deferring decoding where possible.  A top-level
+        JSON object is returned as a `LazyJSONObject`, which decodes each
+        member only when it is accessed.
+        """
+        backend = get_json_backend()
+        body = self.read_body(stream, **options)
+        if body.lstrip().startswith(b"{"):
+            return LazyJSONObject(body, backend.loads)
+        return self._loads(backend, body)
+
+    def iter_parse(self, stream, media_type, **options):
+        """
+        Lazily yield the items of a top-level JSON array, reading the stream
+        in chunks.  Any other top-level value is yielded as a single item.
+        """
+        backend = get_json_backend()
+        settings = get_settings()
+        scanner = JSONScanner(settings.JSON_MAX_DEPTH)
+        chunks = self._iter_chunks(stream, settings.JSON_MAX_BODY_SIZE, **options)
+
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            if buffer.lstrip():
+                break
+        if not buffer.lstrip().startswith(b"["):
+            for chunk in chunks:
+                buffer += chunk
+            scanner.scan(buffer)
+            yield self._loads(backend, buffer)
+            return
+
+        start = buffer.index(b"[")
+        delimiters = scanner.scan(buffer, start)
+        start += 1
+        empty = True
+        while True:
+            for delimiter in delimiters:
+                item = buffer[start:delimiter]
+                char = buffer[delimiter]
+                if char == 0x5D and empty and not item.strip():  # '[]'
+                    return
+                elif char == 0x7D:  # '}'
+                    raise exceptions.ParseError("JSON parse error - Unexpected '}'")
+                yield self._loads(backend, item)
+                empty = False
+                start = delimiter + 1
+                if char == 0x5D:  # ']'
+                    remainder = buffer[start:]
+                    if remainder.strip() or any(chunk.strip() for chunk in chunks):
+                        raise exceptions.ParseError("JSON parse error - Extra data")
+                    return
+
+            del buffer[:start]
+            start = 0
+            chunk = next(chunks, b"")
+            if not chunk:
+                raise exceptions.ParseError("JSON parse error - Unterminated array")
+            pos = len(buffer)
+            buffer += chunk
+            delimiters = scanner.scan(buffer, pos)
+
+    def read_body(self, stream, **options):
+        """
+        Read the request body in chunks, enforcing the `JSON_MAX_BODY_SIZE`
+        and `JSON_MAX_DEPTH` settings as the body is read.
+        """
+        settings = get_settings()
+        scanner = None
+        if settings.JSON_MAX_DEPTH is not None:
+            scanner = JSONScanner(settings.JSON_MAX_DEPTH)
+
+        chunks = []
+        for chunk in self._iter_chunks(stream, settings.JSON_MAX_BODY_SIZE, **options):
+            if scanner is not None:
+                scanner.scan(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _iter_chunks(self, stream, max_size, **options):
+        content_length = options.get("content_length")
+        if max_size is not None and content_length is not None:
+            if content_length > max_size:
+                raise exceptions.RequestEntityTooLarge()
+
+        size = 0
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                return
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise exceptions.RequestEntityTooLarge()
+            yield chunk
+
+    @staticmethod
+    def _loads(backend, data):
+        try:
+            return backend.loads(bytes(data))
+        except ValueError as exc:
+            msg = "JSON parse error - %s" % str(exc)
+            raise exceptions.ParseError(msg)
+
+
+class NDJSONParser(JSONParser):
+    """
+    Parses newline delimited JSON, with one record per line.
+    """
+
+    media_type = "application/x-ndjson"
+    stateless = True
+    parse_lazy = None  # Each record is decoded as it is read.
+
+    def parse(self, stream, media_type, **options):
+        return list(self.iter_parse(stream, media_type, **options))
+
+    def iter_parse(self, stream, media_type, **options):
+        """
+        Lazily yield one decoded record per line, reading the stream in chunks.
+        """
+        backend = get_json_backend()
+        settings = get_settings()
+        chunks = self._iter_chunks(stream, settings.JSON_MAX_BODY_SIZE, **options)
+
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            start = 0
+            end = buffer.find(b"\n")
+            while end != -1:
+                line = buffer[start:end]
+                if line.strip():
+                    yield self._loads_line(backend, line, settings.JSON_MAX_DEPTH)
+                start = end + 1
+                end = buffer.find(b"\n", start)
+            del buffer[:start]
+        if buffer.strip():
+            yield self._loads_line(backend, buffer, settings.JSON_MAX_DEPTH)
+
+    def _loads_line(self, backend, line, max_depth):
+        if max_depth is not None:
+            JSONScanner(max_depth).scan(line)
+        return self._loads(backend, line)
+
+
+class MsgPackParser(BaseParser):
+    media_type = "application/msgpack"
+    stateless = True
+
+    def __init__(self):
+        assert msgpack is not None, "MsgPackParser requires the `msgpack` package"
+
+    def parse(self, stream, media_type, **options):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            msg = "MessagePack parse error - %s" % (str(exc) or type(exc).__name__)
+            raise exceptions.ParseError(msg)
+
+
+class CBORParser(BaseParser):
+    media_type = "application/cbor"
+    stateless = True
+
+    def __init__(self):
+        assert cbor2 is not None, "CBORParser requires the `cbor2` package"
+
+    def parse(self, stream, media_type, **options):
+        try:
+            return cbor2.loads(stream.read())
+        except (ValueError, cbor2.CBORDecodeError) as exc:
+            msg = "CBOR parse error - %s" % str(exc)
+            raise exceptions.ParseError(msg)
+
 
 class MultiPartParser(BaseParser):
     media_type = "multipart/form-data"
+    stateless = True
     handles_file_uploads = True
     handles_form_data = True
 
@@ -42,15 +232,20 @@ class MultiPartParser(BaseParser):
         boundary = boundary.encode("ascii")
 
         content_length = options.get("content_length")
-        assert (
-            content_length is not None
-        ), "MultiPartParser.parse() requires `content_length` argument"
+        settings = get_settings()
+        max_size = settings.MULTIPART_MAX_SIZE
+        if max_size is not None:
+            if content_length is None:
+                # Bodies of unknown length, such as chunked or compressed
+                # bodies, are checked against the limit as they are read.
+                stream = LimitedStream(stream, max_size)
+            elif content_length > max_size:
+                raise exceptions.RequestEntityTooLarge()
 
-        buffer_size = content_length
-        while buffer_size % 4 or buffer_size < 1024:
-            buffer_size += 1
         multipart_parser = WerkzeugMultiPartParser(
-            default_stream_factory, buffer_size=buffer_size
+            self.get_stream_factory(),
+            buffer_size=settings.MULTIPART_CHUNK_SIZE,
+            max_form_parts=settings.MULTIPART_MAX_PARTS,
         )
 
         try:
@@ -58,11 +253,46 @@ class MultiPartParser(BaseParser):
         except ValueError as exc:
             msg = "Multipart parse error - %s" % str(exc)
             raise exceptions.ParseError(msg)
+        except WerkzeugRequestEntityTooLarge:
+            msg = "Multipart message exceeds the maximum number of parts."
+            raise exceptions.RequestEntityTooLarge(msg)
+
+    def get_stream_factory(self):
+        """
+        Return the factory for the file objects that uploads are written to.
+
+        Uses `MULTIPART_STREAM_FACTORY` if it is set, so that uploads may be
+        written straight to a sink.  Otherwise each upload is buffered in
+        memory up to `MULTIPART_MEMORY_THRESHOLD` bytes, and then spooled
+        to a temporary file.
+        """
+        settings = get_settings()
+        if settings.MULTIPART_STREAM_FACTORY is not None:
+            return settings.MULTIPART_STREAM_FACTORY
+
+        threshold = settings.MULTIPART_MEMORY_THRESHOLD
+
+        def stream_factory(total_content_length, content_type, filename, content_length=None):
+            return SpooledTemporaryFile(max_size=threshold, mode="rb+")
+
+        return stream_factory
 
 
 class URLEncodedParser(BaseParser):
     media_type = "application/x-www-form-urlencoded"
+    stateless = True
     handles_form_data = True
 
     def parse(self, stream, media_type, **options):
-        return url_decode_stream(stream)
+        parsed_form = getattr(stream, "parsed_form", None)
+        if parsed_form is not None:
+            return parsed_form
+        if isinstance(media_type, str):
+            media_type = MediaType(media_type)
+        settings = get_settings()
+        return url_decode_stream(
+            stream,
+            charset=media_type.params.get("charset", "utf-8"),
+            max_fields=settings.FORM_MAX_FIELDS,
+            max_field_size=settings.FORM_MAX_FIELD_SIZE,
+        )
@@ -1,10 +1,18 @@
 import pydoc
 import re
+from datetime import timezone
 
 import flask
 from flask import current_app, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
-from flask_api.compat import apply_markdown
+from flask_api.backends import (
+    dumps_with_backend,
+    get_json_backend,
+    get_json_provider,
+)
+from flask_api.compat import apply_markdown, cbor2, msgpack
+from flask_api.helpers import get_instance
 from flask_api.mediatypes import MediaType
 
 
@@ -39,41 +47,188 @@ def convert_to_title(name):
 
 class BaseRenderer:
     media_type = None
+    stateless = False  # If set then a single instance is shared between requests.
     charset = "utf-8"
     handles_empty_responses = False
+    # If set then the content depends only on the data, media type and indent,
+    # so that the content of a `FrozenPayload` may be memoized.  Subclasses
+    # must set it themselves to be memoized.
+    memoizable = False
 
     def render(self, data, media_type, **options):
         msg = '`render()` method must be implemented for class "%s"'
         raise NotImplementedError(msg % self.__class__.__name__)
 
+    def get_process_task(self, data, media_type, **options):
+        """
+        Return a `(func, args)` pair that renders `data` in a worker process,
+        or None if the renderer must be called in the current process.
+
+        `func` must be picklable, and is called without an app or request
+        context, so it may not depend on them.
+        """
+        return None
+
+    def render_stream(self, data, media_type, **options):
+        """
+        Render an iterable of items, returning an iterable of bytestrings.
+
+        Renderers that cannot render incrementally use this default, which
+        collects the items into a list and renders them in full.
+        """
+        content = self.render(list(data), media_type, **options)
+        if isinstance(content, str):
+            content = content.encode(self.charset or "utf-8")
+        return [content]
+
 
 class JSONRenderer(BaseRenderer):
     media_type = "application/json"
+    stateless = True
+    memoizable = True
     charset = None
 
+    stream_chunk_size = 64 * 1024
+
     def render(self, data, media_type, **options):
+        indent = self.get_indent(media_type, **options)
+        return get_json_backend().dumps(data, indent=indent)
+
+    def get_process_task(self, data, media_type, **options):
+        # Without an app context, the backends use Flask's default provider,
+        # so an app with a customized JSON provider must render in process.
+        provider = get_json_provider()
+        if provider is not DefaultJSONProvider and (
+            type(provider) is not DefaultJSONProvider
+            or provider.default is not DefaultJSONProvider.default
+            or provider.sort_keys != DefaultJSONProvider.sort_keys
+        ):
+            return None
+        indent = self.get_indent(media_type, **options)
+        backend = get_json_backend()
+        return dumps_with_backend, (type(backend), data, indent)
+
+    def render_stream(self, data, media_type, **options):
+        indent = self.get_indent(media_type, **options)
+        if indent:
+            return super().render_stream(data, media_type, **options)
+        return self._iter_array(data, get_json_backend())
+
+    def get_indent(self, media_type, **options):
         # Requested indentation may be set in the Accept header.
         try:
             indent = max(min(int(media_type.params["indent"]), 8), 0)
         except (KeyError, ValueError, TypeError):
             indent = None
         # Indent may be set explicitly, eg when rendered by the browsable API.
-        indent = options.get("indent", indent)
-        return current_app.json.dumps(
-            data, ensure_ascii=False, indent=indent
-        )
+        return options.get("indent", indent)
+
+    def _iter_array(self, data, backend):
+        """
+        Encode a JSON array one item at a time, yielding chunks of roughly
+        `stream_chunk_size` bytes.
+        """
+        buffer = bytearray(b"[")
+        separator = b""
+        for item in data:
+            content = backend.dumps(item)
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            buffer += separator
+            buffer += content
+            separator = b", "
+            if len(buffer) >= self.stream_chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline delimited JSON, with one line per list item.
+    """
+
+    media_type = "application/x-ndjson"
+    charset = None
+    stateless = True
+    memoizable = True
+    stream_chunk_size = 64 * 1024
+
+    def render(self, data, media_type, **options):
+        if not isinstance(data, list):
+            data = [data]
+        return b"".join(self.render_stream(data, media_type, **options))
 
+    def render_stream(self, data, media_type, **options):
+        return self._iter_lines(data, get_json_backend())
 
-class HTMLRenderer:
+    def _iter_lines(self, data, backend):
+        buffer = bytearray()
+        for item in data:
+            content = backend.dumps(item)
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            buffer += content
+            buffer += b"\n"
+            if len(buffer) >= self.stream_chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+
+class MsgPackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    charset = None
+    stateless = True
+    memoizable = True
+
+    def __init__(self):
+        assert msgpack is not None, "MsgPackRenderer requires the `msgpack` package"
+
+    def render(self, data, media_type, **options):
+        # Types that msgpack cannot pack are handled as by the JSON provider.
+        default = get_json_provider().default
+        return msgpack.packb(data, default=default, use_bin_type=True)
+
+
+class CBORRenderer(BaseRenderer):
+    media_type = "application/cbor"
+    charset = None
+    stateless = True
+    memoizable = True
+
+    def __init__(self):
+        assert cbor2 is not None, "CBORRenderer requires the `cbor2` package"
+
+    def render(self, data, media_type, **options):
+        # Types that cbor2 cannot encode are handled as by the JSON provider.
+        provider = get_json_provider()
+
+        def default(encoder, value):
+            encoder.encode(provider.default(value))
+
+        # Naive datetimes are treated as UTC, as by the JSON provider.
+        return cbor2.dumps(data, default=default, timezone=timezone.utc)
+
+
+class HTMLRenderer(BaseRenderer):
     media_type = "text/html"
+    stateless = True
     charset = "utf-8"
 
     def render(self, data, media_type, **options):
         return data.encode(self.charset)
 
+    def render_stream(self, data, media_type, **options):
+        for fragment in data:
+            yield self.render(fragment, media_type, **options)
+
 
 class BrowsableAPIRenderer(BaseRenderer):
     media_type = "text/html"
+    stateless = True
     handles_empty_responses = True
     template = "base.html"
 
@@ -86,12 +241,14 @@ class BrowsableAPIRenderer(BaseRenderer):
             if not issubclass(renderer, BrowsableAPIRenderer)
         ]
         assert available_renderers, "BrowsableAPIRenderer cannot be the only renderer"
-        mock_renderer = available_renderers[0]()
-        mock_media_type = MediaType(mock_renderer.media_type)
+        mock_renderer = get_instance(available_renderers[0])
+        mock_media_type = MediaType.parse(mock_renderer.media_type)
         if data == "" and not mock_renderer.handles_empty_responses:
             mock_content = None
         else:
             text = mock_renderer.render(data, mock_media_type, indent=4)
+            if isinstance(text, bytes):
+                text = text.decode("utf-8")
             mock_content = self._html_escape(text)
 
         # Determine the allowed methods on this view.
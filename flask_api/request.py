@@ -1,12 +1,25 @@
 import io
+import re
 
 from flask import Request
 from werkzeug.datastructures import MultiDict
 from werkzeug.wsgi import get_content_length
 
-from flask_api.helpers import url_decode_stream
+from flask_api.compression import DecompressedStream, select_decompressor
+from flask_api.helpers import (
+    LimitedStream,
+    ParsedFormStream,
+    get_instance,
+    run_in_thread,
+    url_decode_stream,
+)
 from flask_api.negotiation import DefaultNegotiation
-from flask_api.settings import default_settings
+from flask_api.settings import default_settings, get_settings
+from flask_api.timing import timed
+
+# Matches a form field whose name starts with an underscore, either as is or
+# percent-encoded, such as the '_method' and '_content' fields.
+_overloading_field = re.compile(rb"(?:^|&)(?:_|%5[fF])")
 
 
 class APIRequest(Request):
@@ -14,6 +27,10 @@ class APIRequest(Request):
     renderer_classes = default_settings.DEFAULT_RENDERERS
     negotiator_class = DefaultNegotiation
     empty_data_class = MultiDict
+    response_etag = None  # Set by the `etag` decorator as an (etag, weak) pair.
+    timings = None  # Set to a `RequestTimings` if `TIMING_ENABLED` is set.
+    accepted_parser = None  # Set to the parser selected for the request body.
+    metrics = None  # Set to the app's `APIMetrics` if `METRICS_ENABLED` is set.
 
     # Request parsing...
 
@@ -35,21 +52,28 @@ class APIRequest(Request):
             self._parse()
         return self._files
 
+    @timed("parse")
     def _parse(self):
         """
         Parse the body of the request, using whichever parser satisfies the
         client 'Content-Type' header.
         """
-        if not self.content_type or not self.content_length:
+        if not self._has_body():
             self._set_empty_data()
             return
 
         negotiator = self.negotiator_class()
-        parsers = [parser_cls() for parser_cls in self.parser_classes]
-        options = self._get_parser_options()
+        parsers = self.get_parsers()
         try:
+            self._decode_content()
+            options = self._get_parser_options()
             parser, media_type = negotiator.select_parser(parsers)
-            ret = parser.parse(self.stream, media_type, **options)
+            self.accepted_parser = parser
+            parse_lazy = getattr(parser, "parse_lazy", None)
+            if get_settings().LAZY_PARSING and parse_lazy is not None:
+                ret = parse_lazy(self.stream, media_type, **options)
+            else:
+                ret = parser.parse(self.stream, media_type, **options)
         except Exception as e:
             # Ensure that accessing `request.data` again does not reraise
             # the exception, so that eg exceptions can handle properly.
@@ -67,6 +91,92 @@ class APIRequest(Request):
 
         self._form = self._data if parser.handles_form_data else self.empty_data_class()
 
+    async def parse_async(self):
+        """
+        Parse the body of the request from an `async def` view, and return
+        `request.data`.
+
+        Bodies of at least `ASYNC_PARSE_THRESHOLD` bytes are parsed in a
+        worker thread, so that large payloads do not block the event loop.
+        """
+        if not hasattr(self, "_data"):
+            threshold = get_settings().ASYNC_PARSE_THRESHOLD
+            content_length = self.content_length
+            if (
+                threshold is not None
+                and content_length is not None
+                and content_length >= threshold
+            ):
+                await run_in_thread(self._parse)
+            else:
+                self._parse()
+        return self._data
+
+    def iter_data(self):
+        """
+        Iterate over the items of the request body as they are parsed.
+
+        If the selected parser supports incremental parsing, the stream is
+        consumed lazily and `request.data` will be empty afterwards.
+        Otherwise the body is parsed in full, and its items are returned.
+        """
+        if not self._has_body():
+            self._set_empty_data()
+            return iter(())
+
+        if hasattr(self, "_data"):
+            data = self._data
+        else:
+            self._decode_content()
+            negotiator = self.negotiator_class()
+            parser, media_type = negotiator.select_parser(self.get_parsers())
+            self.accepted_parser = parser
+            if hasattr(parser, "iter_parse"):
+                options = self._get_parser_options()
+                stream = self.stream
+                self._set_empty_data()
+                return parser.iter_parse(stream, media_type, **options)
+            data = self.data
+        return iter(data if isinstance(data, list) else [data])
+
+    def _has_body(self):
+        """
+        Return True if the request has a body to parse.  A body without a
+        Content-Length, such as a chunked body, is read until the server
+        signals the end of the input.
+        """
+        if not self.content_type:
+            return False
+        if self.content_length is None:
+            return bool(self.environ.get("wsgi.input_terminated"))
+        return self.content_length > 0
+
+    def _decode_content(self):
+        """
+        Decompress the request body as it is read, according to its
+        Content-Encoding header.  The decompressed length is not known in
+        advance, so parsers are passed a `content_length` of None.
+        """
+        encoding = self.headers.get("Content-Encoding", "").strip().lower()
+        settings = get_settings()
+        if encoding in ("", "identity") or not settings.REQUEST_DECOMPRESSION:
+            return
+
+        compressor = select_decompressor(settings.COMPRESSORS, encoding)
+        stream = DecompressedStream(compressor, self.stream)
+        max_size = settings.REQUEST_MAX_DECOMPRESSED_SIZE
+        if max_size is not None:
+            msg = "Decompressed request body exceeds the maximum allowed size."
+            stream = LimitedStream(stream, max_size, msg)
+        self._stream = io.BufferedReader(stream)
+        self._content_length = None
+
+    def get_parsers(self):
+        """
+        Return the parser instances for this request.
+        """
+        return [get_instance(parser_cls) for parser_cls in self.parser_classes]
+
     def _get_parser_options(self):
         """
         Any additional information to pass to the parser.
@@ -95,17 +205,24 @@ class APIRequest(Request):
             self._perform_content_negotiation()
         return self._accepted_media_type
 
+    @timed("negotiate")
     def _perform_content_negotiation(self):
         """
         Determine which of the available renderers should be used for
         rendering the response content, based on the client 'Accept' header.
         """
         negotiator = self.negotiator_class()
-        renderers = [renderer() for renderer in self.renderer_classes]
+        renderers = self.get_renderers()
         self._accepted_renderer, self._accepted_media_type = negotiator.select_renderer(
             renderers
         )
 
+    def get_renderers(self):
+        """
+        Return the renderer instances for this request.
+        """
+        return [get_instance(renderer_cls) for renderer_cls in self.renderer_classes]
+
     # Method and content type overloading.
 
     @property
@@ -155,12 +272,25 @@ class APIRequest(Request):
         if (
             self._method == "POST"
             and self._content_type == "application/x-www-form-urlencoded"
+            and "Content-Encoding" not in self.headers
+            and get_settings().METHOD_OVERLOADING
         ):
             # Read the request data, then push it back onto the stream again.
+            # The stream shares the buffer of the body, rather than copying it.
             body = self.get_data()
-            data = url_decode_stream(io.BytesIO(body))
             self._stream = io.BytesIO(body)
-            if "_method" in data:
+            if not _overloading_field.search(body):
+                # No overloading field can be present, so avoid decoding the body.
+                return
+
+            settings = get_settings()
+            data = url_decode_stream(
+                io.BytesIO(body),
+                max_fields=settings.FORM_MAX_FIELDS,
+                max_field_size=settings.FORM_MAX_FIELD_SIZE,
+            )
+            self._stream = ParsedFormStream(body, data)
+            if data.get("_method"):
                 # Support browser forms with PUT, PATCH, DELETE & other methods.
                 self._method = data["_method"]
             if "_content" in data and "_content_type" in data:
@@ -1,23 +1,86 @@
-from flask import Response, request
+from flask import Response, request, stream_with_context
+from werkzeug.http import generate_etag
+
+from flask_api.compression import select_compressor
+from flask_api.exceptions import APIException
+from flask_api.executors import count_items, get_render_executor
+from flask_api.helpers import run_in_thread
+from flask_api.mediatypes import MediaType
+from flask_api.memo import get_render_memo
+from flask_api.settings import get_settings
+
+
+class StreamingList:
+    """
+    Wraps an iterable so that it is rendered incrementally as a list,
+    without materializing the whole response in memory.
+    """
+
+    def __init__(self, iterable):
+        self.iterable = iterable
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+
+class FrozenPayload:
+    """
+    Wraps data that is not modified between requests, such as a module level
+    dict, so that its rendered content may be memoized by renderers that set
+    `memoizable`.
+
+    If the data may change, pass a `version` that changes with it, or a
+    callable returning the current version.  Content is re-rendered whenever
+    the version differs from the one it was rendered at.
+    """
+
+    def __init__(self, data, version=None):
+        self.data = data
+        self.version = version
+
+    def get_version(self):
+        if callable(self.version):
+            return self.version()
+        return self.version
 
 
 class APIResponse(Response):
 
-    api_return_types = (list, dict)
+    api_return_types = (list, dict, FrozenPayload)
+    api_streaming_types = (StreamingList,)
 
     def __init__(self, content=None, *args, **kwargs):
         super().__init__(None, *args, **kwargs)
 
         media_type = None
-        if isinstance(content, self.api_return_types) or content == "":
+        if isinstance(content, self.api_streaming_types):
+            renderer = request.accepted_renderer
+            media_type = request.accepted_media_type
+            options = self.get_renderer_options()
+            content = renderer.render_stream(content, media_type, **options)
+            content = stream_with_context(iter(content))
+        elif isinstance(content, self.api_return_types) or content == "":
             renderer = request.accepted_renderer
             if content != "" or renderer.handles_empty_responses:
                 media_type = request.accepted_media_type
-                options = self.get_renderer_options()
-                content = renderer.render(content, media_type, **options)
+                if isinstance(content, FrozenPayload):
+                    render = self.render_payload
+                else:
+                    render = self.render_content
+                timings = request.timings
+                if timings is None:
+                    content = render(renderer, content, media_type)
+                else:
+                    content = timings.measure(
+                        "render", render, renderer, content, media_type
+                    )
                 if self.status_code == 204:
                     self.status_code = 200
 
+        if media_type is not None:
+            self.set_content_etag(content)
+            content = self.compress_content(content, media_type)
+
         # From `werkzeug.wrappers.BaseResponse`
         if content is None:
             content = []
@@ -28,6 +91,120 @@ class APIResponse(Response):
 
         if media_type is not None:
             self.headers["Content-Type"] = str(media_type)
+            if "ETag" in self.headers and self.status_code == 200:
+                self.make_conditional(request.environ)
+
+    @classmethod
+    async def create_async(cls, content=None, *args, **kwargs):
+        """
+        Create a response from an `async def` view, rendering the content in
+        a worker thread so that large payloads do not block the event loop.
+        """
+        return await run_in_thread(cls, content, *args, **kwargs)
+
+    def render_content(self, renderer, content, media_type):
+        """
+        Render the response content.  Payloads of more than
+        `RENDER_OFFLOAD_THRESHOLD` values are rendered by the render
+        executor, if one is set by `RENDER_EXECUTOR`.
+        """
+        options = self.get_renderer_options()
+        executor = get_render_executor()
+        if executor is None:
+            return renderer.render(content, media_type, **options)
+
+        threshold = get_settings().RENDER_OFFLOAD_THRESHOLD
+        if threshold is not None and count_items(content, threshold) <= threshold:
+            return renderer.render(content, media_type, **options)
+
+        try:
+            return executor.render(renderer, content, media_type, **options)
+        except APIException as exc:
+            # Rendering has timed out, so render the error instead.
+            self.status_code = exc.status_code
+            options = self.get_renderer_options()
+            return renderer.render({"message": exc.detail}, media_type, **options)
+
+    def render_payload(self, renderer, payload, media_type):
+        """
+        Render a `FrozenPayload`, reusing the content from a previous render
+        of the same data and version if the renderer is `memoizable`.
+        """
+        # The flag is not inherited, as a subclass may render differently.
+        memoizable = type(renderer).__dict__.get("memoizable", False)
+        memo = get_render_memo() if memoizable else None
+        if memo is None:
+            return self.render_content(renderer, payload.data, media_type)
+
+        options = self.get_renderer_options()
+        key = memo.get_key(payload, renderer, media_type, **options)
+        content = memo.get(key, payload.data)
+        if content is None:
+            status_code = self.status_code
+            content = self.render_content(renderer, payload.data, media_type)
+            # Content rendered in place of a timed out render is not reused.
+            if self.status_code == status_code:
+                memo.set(key, payload.data, content)
+        return content
+
+    def set_content_etag(self, content):
+        """
+        Set the ETag of the response to the view's precomputed ETag, or if
+        `ETAGS` is set to 'strong' or 'weak', to a hash of the rendered
+        content.  Streaming content only uses a precomputed ETag.
+        """
+        if "ETag" in self.headers or self.status_code != 200:
+            return
+        if request.response_etag is not None:
+            etag, weak = request.response_etag
+            self.set_etag(etag, weak=weak)
+            return
+
+        mode = get_settings().ETAGS
+        if mode is None or not isinstance(content, (str, bytes, bytearray)):
+            return
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.set_etag(generate_etag(content), weak=mode == "weak")
+
+    def compress_content(self, content, media_type):
+        """
+        Compress the rendered content with the best encoding accepted by the
+        client, if `COMPRESSION_ENABLED` is set and the media type is listed
+        in `COMPRESSION_MEDIA_TYPES`.  Streaming content is compressed chunk
+        by chunk, and other content of less than `COMPRESSION_MIN_SIZE`
+        bytes is left uncompressed.
+        """
+        settings = get_settings()
+        if not settings.COMPRESSION_ENABLED or "Content-Encoding" in self.headers:
+            return content
+        if not any(
+            MediaType.parse(allowed).satisfies(media_type)
+            for allowed in settings.COMPRESSION_MEDIA_TYPES
+        ):
+            return content
+
+        self.vary.add("Accept-Encoding")
+        compressor = select_compressor(settings.COMPRESSORS, request.accept_encodings)
+        if compressor is None:
+            return content
+
+        if isinstance(content, (str, bytes, bytearray)):
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            if len(content) < settings.COMPRESSION_MIN_SIZE:
+                return content
+            content = compressor.compress(content)
+        else:
+            content = compressor.iter_compress(content)
+        self.headers["Content-Encoding"] = compressor.encoding
+
+        # The compressed bytes differ between encodings, so only a weak ETag
+        # still holds for them.
+        etag, weak = self.get_etag()
+        if etag is not None and not weak:
+            self.set_etag(etag, weak=True)
+        return content
 
     def get_renderer_options(self):
         return {
@@ -1,5 +1,9 @@
 import importlib
 
+from flask import current_app, has_app_context
+
+from flask_api.compat import brotli, cbor2, msgpack, zstandard
+
 
 def perform_imports(val, setting_name):
     """
@@ -29,28 +33,312 @@ def import_from_string(val, setting_name):
         raise ImportError(msg)
 
 
+default_parsers = [
+    "flask_api.parsers.JSONParser",
+    "flask_api.parsers.URLEncodedParser",
+    "flask_api.parsers.MultiPartParser",
+    "flask_api.parsers.NDJSONParser",
+]
+default_renderers = [
+    "flask_api.renderers.JSONRenderer",
+    "flask_api.renderers.BrowsableAPIRenderer",
+    "flask_api.renderers.NDJSONRenderer",
+]
+
+# Binary formats are negotiated by default if their packages are installed.
+if msgpack is not None:
+    default_parsers.append("flask_api.parsers.MsgPackParser")
+    default_renderers.append("flask_api.renderers.MsgPackRenderer")
+if cbor2 is not None:
+    default_parsers.append("flask_api.parsers.CBORParser")
+    default_renderers.append("flask_api.renderers.CBORRenderer")
+
+# Compressors are listed in order of preference.
+default_compressors = [
+    "flask_api.compression.GzipCompressor",
+    "flask_api.compression.DeflateCompressor",
+]
+if zstandard is not None:
+    default_compressors.insert(0, "flask_api.compression.ZstdCompressor")
+if brotli is not None:
+    default_compressors.insert(0, "flask_api.compression.BrotliCompressor")
+
+
 class APISettings:
+    """
+    Resolved API settings.
+
+    Import strings are resolved once and memoized as tuples, so that the
+    per-request lookups are a dictionary access rather than an import.
+    A setting is re-resolved automatically if its config value is replaced,
+    and `reload()` may be called if a config value is mutated in place.
+    """
+
+    defaults = {
+        "DEFAULT_PARSERS": tuple(default_parsers),
+        "DEFAULT_RENDERERS": tuple(default_renderers),
+        "DEFAULT_JSON_BACKEND": "flask_api.backends.StdlibJSONBackend",
+        "JSON_MAX_BODY_SIZE": None,
+        "JSON_MAX_DEPTH": None,
+        "MULTIPART_CHUNK_SIZE": 64 * 1024,
+        "MULTIPART_MEMORY_THRESHOLD": 500 * 1024,
+        "MULTIPART_MAX_PARTS": 1000,
+        "MULTIPART_MAX_SIZE": None,
+        "MULTIPART_STREAM_FACTORY": None,
+        "METHOD_OVERLOADING": True,
+        "FORM_MAX_FIELDS": None,
+        "FORM_MAX_FIELD_SIZE": None,
+        "LAZY_PARSING": False,
+        "ASYNC_PARSE_THRESHOLD": 64 * 1024,
+        "RENDER_EXECUTOR": None,
+        "RENDER_EXECUTOR_WORKERS": None,
+        "RENDER_OFFLOAD_THRESHOLD": 10000,
+        "RENDER_TIMEOUT": None,
+        "RENDER_FALLBACK": "inline",
+        "RENDER_MEMO_MAX_SIZE": 16 * 1024 * 1024,
+        "COMPRESSION_ENABLED": False,
+        "COMPRESSORS": tuple(default_compressors),
+        "COMPRESSION_MIN_SIZE": 1024,
+        "COMPRESSION_MEDIA_TYPES": (
+            "application/json",
+            "application/x-ndjson",
+            "text/*",
+        ),
+        "REQUEST_DECOMPRESSION": True,
+        "REQUEST_MAX_DECOMPRESSED_SIZE": 16 * 1024 * 1024,
+        "ETAGS": None,
+        "CACHE_BACKEND": "flask_api.cache.MemoryCache",
+        "CACHE_OPTIONS": None,
+        "CACHE_DEFAULT_TIMEOUT": 60,
+        "TIMING_ENABLED": False,
+        "TIMING_HEADER": False,
+        "TIMING_BUCKETS": (
+            0.001,
+            0.0025,
+            0.005,
+            0.01,
+            0.025,
+            0.05,
+            0.1,
+            0.25,
+            0.5,
+            1.0,
+            2.5,
+            5.0,
+            10.0,
+        ),
+        "METRICS_ENABLED": False,
+        "METRICS_SIZE_BUCKETS": (
+            100,
+            1000,
+            10 * 1000,
+            100 * 1000,
+            1000 * 1000,
+            10 * 1000 * 1000,
+        ),
+    }
+
+    # Settings that may be given as import strings.
+    import_strings = (
+        "DEFAULT_PARSERS",
+        "DEFAULT_RENDERERS",
+        "DEFAULT_JSON_BACKEND",
+        "MULTIPART_STREAM_FACTORY",
+        "COMPRESSORS",
+        "CACHE_BACKEND",
+    )
+
     def __init__(self, user_config=None):
         self.user_config = user_config or {}
+        self._resolved = {}
+
+    def get(self, setting_name):
+        """
+        Return the resolved value for the given setting.
+        """
+        val = self.user_config.get(setting_name, self.defaults[setting_name])
+        try:
+            cached_val, resolved = self._resolved[setting_name]
+        except KeyError:
+            pass
+        else:
+            if cached_val is val:
+                return resolved
+
+        resolved = val
+        if setting_name in self.import_strings:
+            resolved = perform_imports(val, setting_name)
+        if isinstance(resolved, list):
+            resolved = tuple(resolved)
+        self._resolved[setting_name] = (val, resolved)
+        return resolved
+
+    def validate(self):
+        """
+        Resolve every setting, raising `ImportError` for any bad import string.
+        """
+        for setting_name in self.defaults:
+            self.get(setting_name)
+
+    def reload(self):
+        """
+        Discard any resolved settings, so they are re-read from the config.
+        """
+        self._resolved.clear()
 
     @property
     def DEFAULT_PARSERS(self):
-        default = [
-            "flask_api.parsers.JSONParser",
-            "flask_api.parsers.URLEncodedParser",
-            "flask_api.parsers.MultiPartParser",
-        ]
-        val = self.user_config.get("DEFAULT_PARSERS", default)
-        return perform_imports(val, "DEFAULT_PARSERS")
+        return self.get("DEFAULT_PARSERS")
 
     @property
     def DEFAULT_RENDERERS(self):
-        default = [
-            "flask_api.renderers.JSONRenderer",
-            "flask_api.renderers.BrowsableAPIRenderer",
-        ]
-        val = self.user_config.get("DEFAULT_RENDERERS", default)
-        return perform_imports(val, "DEFAULT_RENDERERS")
+        return self.get("DEFAULT_RENDERERS")
+
+    @property
+    def DEFAULT_JSON_BACKEND(self):
+        return self.get("DEFAULT_JSON_BACKEND")
+
+    @property
+    def JSON_MAX_BODY_SIZE(self):
+        return self.get("JSON_MAX_BODY_SIZE")
+
+    @property
+    def JSON_MAX_DEPTH(self):
+        return self.get("JSON_MAX_DEPTH")
+
+    @property
+    def MULTIPART_CHUNK_SIZE(self):
+        return self.get("MULTIPART_CHUNK_SIZE")
+
+    @property
+    def MULTIPART_MEMORY_THRESHOLD(self):
+        return self.get("MULTIPART_MEMORY_THRESHOLD")
+
+    @property
+    def MULTIPART_MAX_PARTS(self):
+        return self.get("MULTIPART_MAX_PARTS")
+
+    @property
+    def MULTIPART_MAX_SIZE(self):
+        return self.get("MULTIPART_MAX_SIZE")
+
+    @property
+    def MULTIPART_STREAM_FACTORY(self):
+        return self.get("MULTIPART_STREAM_FACTORY")
+
+    @property
+    def METHOD_OVERLOADING(self):
+        return self.get("METHOD_OVERLOADING")
+
+    @property
+    def FORM_MAX_FIELDS(self):
+        return self.get("FORM_MAX_FIELDS")
+
+    @property
+    def FORM_MAX_FIELD_SIZE(self):
+        return self.get("FORM_MAX_FIELD_SIZE")
+
+    @property
+    def LAZY_PARSING(self):
+        return self.get("LAZY_PARSING")
+
+    @property
+    def ASYNC_PARSE_THRESHOLD(self):
+        return self.get("ASYNC_PARSE_THRESHOLD")
+
+    @property
+    def RENDER_EXECUTOR(self):
+        return self.get("RENDER_EXECUTOR")
+
+    @property
+    def RENDER_EXECUTOR_WORKERS(self):
+        return self.get("RENDER_EXECUTOR_WORKERS")
+
+    @property
+    def RENDER_OFFLOAD_THRESHOLD(self):
+        return self.get("RENDER_OFFLOAD_THRESHOLD")
+
+    @property
+    def RENDER_TIMEOUT(self):
+        return self.get("RENDER_TIMEOUT")
+
+    @property
+    def RENDER_FALLBACK(self):
+        return self.get("RENDER_FALLBACK")
+
+    @property
+    def RENDER_MEMO_MAX_SIZE(self):
+        return self.get("RENDER_MEMO_MAX_SIZE")
+
+    @property
+    def COMPRESSION_ENABLED(self):
+        return self.get("COMPRESSION_ENABLED")
+
+    @property
+    def COMPRESSORS(self):
+        return self.get("COMPRESSORS")
+
+    @property
+    def COMPRESSION_MIN_SIZE(self):
+        return self.get("COMPRESSION_MIN_SIZE")
+
+    @property
+    def COMPRESSION_MEDIA_TYPES(self):
+        return self.get("COMPRESSION_MEDIA_TYPES")
+
+    @property
+    def REQUEST_DECOMPRESSION(self):
+        return self.get("REQUEST_DECOMPRESSION")
+
+    @property
+    def REQUEST_MAX_DECOMPRESSED_SIZE(self):
+        return self.get("REQUEST_MAX_DECOMPRESSED_SIZE")
+
+    @property
+    def ETAGS(self):
+        return self.get("ETAGS")
+
+    @property
+    def CACHE_BACKEND(self):
+        return self.get("CACHE_BACKEND")
+
+    @property
+    def CACHE_OPTIONS(self):
+        return self.get("CACHE_OPTIONS")
+
+    @property
+    def CACHE_DEFAULT_TIMEOUT(self):
+        return self.get("CACHE_DEFAULT_TIMEOUT")
+
+    @property
+    def TIMING_ENABLED(self):
+        return self.get("TIMING_ENABLED")
+
+    @property
+    def TIMING_HEADER(self):
+        return self.get("TIMING_HEADER")
+
+    @property
+    def TIMING_BUCKETS(self):
+        return self.get("TIMING_BUCKETS")
+
+    @property
+    def METRICS_ENABLED(self):
+        return self.get("METRICS_ENABLED")
+
+    @property
+    def METRICS_SIZE_BUCKETS(self):
+        return self.get("METRICS_SIZE_BUCKETS")
 
 
 default_settings = APISettings()
+
+
+def get_settings():
+    """
+    Return the API settings for the current app, or the default settings
+    if there is no app context.
+    """
+    if has_app_context():
+        return getattr(current_app, "api_settings", default_settings)
+    return default_settings
@@ -4,7 +4,9 @@ import unittest
 from flask import abort, jsonify, make_response, request
 
 from flask_api import FlaskAPI, exceptions, renderers, status
-from flask_api.decorators import set_renderers
+from flask_api.decorators import etag, set_renderers
+from flask_api.mediatypes import MediaType
+from flask_api.response import StreamingList
 
 app = FlaskAPI(__name__)
 app.config["TESTING"] = True
@@ -12,6 +14,7 @@ app.config["TESTING"] = True
 
 class JSONVersion1(renderers.JSONRenderer):
     media_type = 'application/json; api-version="1.0"'
+    stateless = True
 
 
 class JSONVersion2(renderers.JSONRenderer):
@@ -102,6 +105,27 @@ def accepted_media_type():
     return {"accepted_media_type": str(request.accepted_media_type)}
 
 
+@app.route("/renderer_instance/")
+@set_renderers(JSONVersion1)
+def renderer_instance():
+    return {"renderer_id": id(request.accepted_renderer)}
+
+
+@app.route("/generator/")
+def generator_view():
+    return (text for text in ("hello ", "world"))
+
+
+@app.route("/streaming_items/")
+def streaming_items_view():
+    return StreamingList({"id": idx} for idx in range(3))
+
+
+@app.route("/streaming_list/")
+def streaming_list_view():
+    return StreamingList(range(3)), status.HTTP_201_CREATED
+
+
 class AppTests(unittest.TestCase):
     def test_set_status_and_headers(self):
         with app.test_client() as client:
@@ -190,3 +214,156 @@ class AppTests(unittest.TestCase):
             data = json.loads(response.get_data().decode("utf8"))
             expected = {"accepted_media_type": 'application/json; api-version="2.0"'}
             self.assertEqual(data, expected)
+
+    def test_decorated_renderers_available_before_view(self):
+        app = FlaskAPI(__name__)
+        seen = []
+
+        @app.before_request
+        def record_renderer_classes():
+            seen.append(request.renderer_classes)
+
+        @app.route("/")
+        @set_renderers(JSONVersion1)
+        def index():
+            return {}
+
+        with app.test_client() as client:
+            client.get("/")
+        self.assertEqual(seen, [(JSONVersion1,)])
+
+    def test_renderer_instances_are_shared_per_endpoint(self):
+        with app.test_client() as client:
+            first = json.loads(client.get("/renderer_instance/").get_data())
+            second = json.loads(client.get("/renderer_instance/").get_data())
+        self.assertEqual(first, second)
+
+    def test_generator_response(self):
+        with app.test_client() as client:
+            response = client.get("/generator/")
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.mimetype, "text/html")
+            self.assertEqual(response.get_data(), b"hello world")
+
+    def test_streaming_items_response(self):
+        with app.test_client() as client:
+            response = client.get("/streaming_items/")
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.content_type, "application/json")
+            expected = [{"id": 0}, {"id": 1}, {"id": 2}]
+            self.assertEqual(json.loads(response.get_data()), expected)
+
+    def test_streaming_list_response(self):
+        with app.test_client() as client:
+            response = client.get("/streaming_list/")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.get_data(), b"[0, 1, 2]")
+
+    def test_streaming_response_with_indent(self):
+        renderer = renderers.JSONRenderer()
+        media_type = MediaType("application/json; indent=2")
+        with app.app_context():
+            chunks = renderer.render_stream(iter(range(3)), media_type)
+        self.assertEqual(b"".join(chunks), b"[\n  0,\n  1,\n  2\n]")
+
+    def test_streaming_response_is_chunked(self):
+        renderer = renderers.JSONRenderer()
+        renderer.stream_chunk_size = 8
+        with app.app_context():
+            media_type = MediaType("application/json")
+            chunks = list(renderer.render_stream(range(10), media_type))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b"".join(chunks)), list(range(10)))
+
+    def test_streaming_browsable_response(self):
+        with app.test_client() as client:
+            headers = {"Accept": "text/html"}
+            response = client.get("/streaming_items/", headers=headers)
+            self.assertEqual(response.content_type, "text/html")
+            self.assertIn('"id": 2', response.get_data(as_text=True))
+
+
+class ETagTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.app.config["ETAGS"] = "strong"
+        self.version = 1
+        self.calls = 0
+
+        @self.app.route("/items/")
+        def items():
+            self.calls += 1
+            return [{"id": i, "text": "example" * 20} for i in range(20)]
+
+        @self.app.route("/versioned/")
+        @etag(lambda: self.version)
+        def versioned():
+            self.calls += 1
+            return {"version": self.version}
+
+        @self.app.route("/created/", methods=["POST"])
+        def created():
+            return {"created": True}, status.HTTP_201_CREATED
+
+    def get(self, url, **headers):
+        with self.app.test_client() as client:
+            return client.get(url, headers=headers)
+
+    def test_etag_and_not_modified(self):
+        response = self.get("/items/")
+        etag = response.headers["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        response = self.get("/items/", **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.get_data(), b"")
+
+        response = self.get("/items/", **{"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_weak_etag(self):
+        self.app.config["ETAGS"] = "weak"
+        response = self.get("/items/")
+        self.assertTrue(response.headers["ETag"].startswith("W/"))
+
+    def test_etags_disabled(self):
+        self.app.config["ETAGS"] = None
+        self.assertNotIn("ETag", self.get("/items/").headers)
+
+    def test_etag_differs_by_media_type(self):
+        json_etag = self.get("/items/").headers["ETag"]
+        html_etag = self.get("/items/", Accept="text/html").headers["ETag"]
+        self.assertNotEqual(json_etag, html_etag)
+
+    def test_compressed_response_has_weak_etag(self):
+        self.app.config["COMPRESSION_ENABLED"] = True
+        response = self.get("/items/", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+
+        # An uncompressed response with the same content matches weakly.
+        response = self.get("/items/", **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_etag_for_other_status_codes(self):
+        with self.app.test_client() as client:
+            response = client.post("/created/")
+        self.assertNotIn("ETag", response.headers)
+
+    def test_precomputed_etag_skips_view(self):
+        response = self.get("/versioned/")
+        self.assertEqual(response.json, {"version": 1})
+        etag = response.headers["ETag"]
+        self.assertEqual(self.calls, 1)
+
+        response = self.get("/versioned/", **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.calls, 1)
+
+        self.version = 2
+        response = self.get("/versioned/", **{"If-None-Match": etag})
+        self.assertEqual(response.json, {"version": 2})
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.calls, 2)
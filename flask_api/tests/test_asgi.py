@@ -0,0 +1,126 @@
+import asyncio
+import json
+import unittest
+
+from flask import request
+
+from flask_api import FlaskAPI, renderers
+from flask_api.decorators import set_renderers
+from flask_api.response import StreamingList
+
+app = FlaskAPI(__name__)
+
+
+class SmallChunkJSONRenderer(renderers.JSONRenderer):
+    stream_chunk_size = 1
+
+
+@app.route("/echo/", methods=["POST"])
+def echo():
+    return {"data": request.data, "query": request.args.to_dict()}
+
+
+@app.route("/export/")
+@set_renderers(SmallChunkJSONRenderer)
+def export():
+    return StreamingList({"id": i} for i in range(3))
+
+
+def call_asgi(asgi_app, scope, messages):
+    """
+    Run an ASGI application in process, feeding it the given `receive`
+    messages and returning the messages that it sends.
+    """
+    incoming = list(messages)
+    sent = []
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    return sent
+
+
+def http_scope(method, path, headers=(), query_string=b""):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string,
+        "headers": list(headers),
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+
+
+class ASGITests(unittest.TestCase):
+    def test_request_body_is_streamed(self):
+        body = b'{"key": [1, 2, 3]}'
+        scope = http_scope(
+            "POST",
+            "/echo/",
+            headers=[
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            query_string=b"page=2",
+        )
+        messages = [
+            {"type": "http.request", "body": body[:5], "more_body": True},
+            {"type": "http.request", "body": body[5:], "more_body": False},
+        ]
+        sent = call_asgi(app.as_asgi(), scope, messages)
+
+        self.assertEqual(sent[0]["type"], "http.response.start")
+        self.assertEqual(sent[0]["status"], 200)
+        self.assertIn((b"content-type", b"application/json"), sent[0]["headers"])
+        content = b"".join(message.get("body", b"") for message in sent[1:])
+        self.assertEqual(
+            json.loads(content), {"data": {"key": [1, 2, 3]}, "query": {"page": "2"}}
+        )
+        self.assertFalse(sent[-1].get("more_body", False))
+
+    def test_request_body_without_content_length(self):
+        scope = http_scope(
+            "POST", "/echo/", headers=[(b"content-type", b"application/json")]
+        )
+        messages = [
+            {"type": "http.request", "body": b'{"key":', "more_body": True},
+            {"type": "http.request", "body": b" 1}", "more_body": False},
+        ]
+        sent = call_asgi(app.as_asgi(), scope, messages)
+
+        self.assertEqual(sent[0]["status"], 200)
+        content = b"".join(message.get("body", b"") for message in sent[1:])
+        self.assertEqual(json.loads(content)["data"], {"key": 1})
+
+    def test_response_body_is_streamed(self):
+        sent = call_asgi(app.as_asgi(), http_scope("GET", "/export/"), [])
+
+        self.assertEqual(sent[0]["status"], 200)
+        chunks = [message["body"] for message in sent[1:] if message["body"]]
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(message["more_body"] for message in sent[1:-1]))
+        self.assertEqual(
+            json.loads(b"".join(chunks)), [{"id": 0}, {"id": 1}, {"id": 2}]
+        )
+
+    def test_not_found(self):
+        sent = call_asgi(app.as_asgi(), http_scope("GET", "/missing/"), [])
+        self.assertEqual(sent[0]["status"], 404)
+
+    def test_lifespan(self):
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = call_asgi(app.as_asgi(), {"type": "lifespan"}, messages)
+        self.assertEqual(
+            [message["type"] for message in sent],
+            ["lifespan.startup.complete", "lifespan.shutdown.complete"],
+        )
@@ -0,0 +1,209 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from flask import request
+
+from flask_api import FlaskAPI, status
+from flask_api.cache import CacheEntry, FileCache, MemoryCache
+from flask_api.decorators import cache_response
+
+
+def make_entry(body=b"content", expires=None):
+    return CacheEntry(body, 200, [("Content-Type", "application/json")], expires)
+
+
+class MemoryCacheTests(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = MemoryCache()
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", make_entry())
+        self.assertEqual(cache.get("key").body, b"content")
+
+    def test_expiry(self):
+        cache = MemoryCache()
+        cache.set("key", make_entry(expires=time.time() - 1))
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_lru_eviction_by_entries(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", make_entry())
+        cache.set("b", make_entry())
+        cache.get("a")
+        cache.set("c", make_entry())
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_eviction_by_size(self):
+        cache = MemoryCache(max_size=10)
+        cache.set("a", make_entry(b"x" * 6))
+        cache.set("b", make_entry(b"x" * 6))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 6)
+
+        # Entries larger than the cache are not stored.
+        cache.set("c", make_entry(b"x" * 11))
+        self.assertIsNone(cache.get("c"))
+
+
+class FileCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_and_set(self):
+        cache = FileCache(self.directory)
+        cache.set("key", make_entry())
+        # A second instance, such as in another process, shares the entries.
+        self.assertEqual(FileCache(self.directory).get("key").body, b"content")
+
+    def test_expiry(self):
+        cache = FileCache(self.directory)
+        cache.set("key", make_entry(expires=time.time() - 1))
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_eviction(self):
+        cache = FileCache(self.directory, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, make_entry())
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_clear(self):
+        cache = FileCache(self.directory)
+        cache.set("key", make_entry())
+        cache.clear()
+        self.assertIsNone(cache.get("key"))
+
+
+class CacheResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+        @self.app.route("/items/", methods=["GET", "POST"])
+        @cache_response(timeout=60, vary=["X-Tenant"])
+        def items():
+            self.calls += 1
+            return {"calls": self.calls, "page": request.args.get("page")}
+
+        @self.app.route("/private/")
+        @cache_response()
+        def private():
+            self.calls += 1
+            return {"calls": self.calls}, {"Cache-Control": "private"}
+
+        @self.app.route("/slow_private/")
+        @cache_response()
+        def slow_private():
+            with self.lock:
+                self.calls += 1
+                self.running += 1
+                self.max_running = max(self.running, self.max_running)
+            time.sleep(0.1)
+            with self.lock:
+                self.running -= 1
+            return {"calls": self.calls}, {"Cache-Control": "private"}
+
+        @self.app.route("/slow/")
+        @cache_response()
+        def slow():
+            self.calls += 1
+            time.sleep(0.1)
+            return {"calls": self.calls}
+
+    def get(self, url, **headers):
+        with self.app.test_client() as client:
+            return client.get(url, headers=headers)
+
+    def get_stats(self):
+        return self.app.extensions["flask_api.response_cache"].stats()
+
+    def test_response_is_cached(self):
+        self.assertEqual(self.get("/items/").json["calls"], 1)
+        response = self.get("/items/")
+        self.assertEqual(response.json["calls"], 1)
+        self.assertEqual(response.content_type, "application/json")
+        stats = self.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_cache_key(self):
+        self.get("/items/")
+        self.assertEqual(self.get("/items/?page=2").json["calls"], 2)
+        self.assertEqual(self.get("/items/", **{"X-Tenant": "a"}).json["calls"], 3)
+        response = self.get("/items/", Accept="text/html")
+        self.assertEqual(response.content_type, "text/html")
+        with self.app.test_client() as client:
+            client.get("/items/", base_url="http://other.example.com")
+            client.get("/items/", base_url="http://localhost/mounted")
+        self.assertEqual(self.calls, 6)
+
+    def test_post_is_not_cached(self):
+        with self.app.test_client() as client:
+            client.post("/items/")
+            client.post("/items/")
+        self.assertEqual(self.calls, 2)
+
+    def test_private_response_is_not_cached(self):
+        self.get("/private/")
+        self.get("/private/")
+        self.assertEqual(self.calls, 2)
+
+    def test_timeout(self):
+        self.app.config["CACHE_DEFAULT_TIMEOUT"] = 0
+        self.get("/slow/")
+        self.get("/slow/")
+        self.assertEqual(self.calls, 2)
+
+    def test_conditional_request_on_cached_response(self):
+        self.app.config["ETAGS"] = "strong"
+        etag = self.get("/items/").headers["ETag"]
+        response = self.get("/items/", **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.calls, 1)
+
+    def test_stampede_protection(self):
+        threads = [
+            threading.Thread(target=self.get, args=("/slow/",)) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        stats = self.get_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["coalesced"] + stats["hits"], 4)
+
+    def test_uncacheable_responses_are_not_serialized(self):
+        threads = [
+            threading.Thread(target=self.get, args=("/slow_private/",))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 5)
+        # Only the first request holds up the others.
+        self.assertGreater(self.max_running, 1)
+
+    def test_file_backend(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.app.config["CACHE_BACKEND"] = "flask_api.cache.FileCache"
+        self.app.config["CACHE_OPTIONS"] = {"directory": directory}
+        self.get("/items/")
+        self.assertEqual(self.get("/items/").json["calls"], 1)
+        self.assertEqual(self.get_stats()["entries"], 1)
@@ -0,0 +1,152 @@
+import gzip
+import json
+import unittest
+import zlib
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from flask_api import FlaskAPI, compression, renderers
+from flask_api.compat import brotli, zstandard
+from flask_api.decorators import set_renderers
+from flask_api.response import StreamingList
+
+app = FlaskAPI(__name__)
+app.config["COMPRESSION_ENABLED"] = True
+
+
+class SmallChunkJSONRenderer(renderers.JSONRenderer):
+    stream_chunk_size = 1
+
+
+@app.route("/items/<int:count>/")
+def items(count):
+    return [{"id": i, "text": "example"} for i in range(count)]
+
+
+@app.route("/stream/")
+@set_renderers(SmallChunkJSONRenderer)
+def stream():
+    return StreamingList({"id": i, "text": "example"} for i in range(100))
+
+
+def accept_encodings(value):
+    return parse_accept_header(value, Accept)
+
+
+class SelectCompressorTests(unittest.TestCase):
+    compressors = (compression.GzipCompressor, compression.DeflateCompressor)
+
+    def select(self, value):
+        compressor = compression.select_compressor(
+            self.compressors, accept_encodings(value)
+        )
+        return None if compressor is None else compressor.encoding
+
+    def test_select_by_preference(self):
+        self.assertEqual(self.select("deflate, gzip"), "gzip")
+
+    def test_select_by_quality(self):
+        self.assertEqual(self.select("gzip;q=0.5, deflate"), "deflate")
+
+    def test_select_wildcard(self):
+        self.assertEqual(self.select("*"), "gzip")
+
+    def test_select_none(self):
+        self.assertIsNone(self.select("identity"))
+        self.assertIsNone(self.select("gzip;q=0"))
+        self.assertIsNone(self.select(""))
+
+
+class ResponseCompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.config = dict(app.config)
+
+    def tearDown(self):
+        app.config.clear()
+        app.config.update(self.config)
+
+    def get(self, url, accept_encoding="gzip, deflate"):
+        with app.test_client() as client:
+            return client.get(url, headers={"Accept-Encoding": accept_encoding})
+
+    def test_gzip_response(self):
+        response = self.get("/items/100/")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertEqual(
+            response.headers["Content-Length"], str(len(response.get_data()))
+        )
+        content = json.loads(gzip.decompress(response.get_data()))
+        self.assertEqual(len(content), 100)
+
+    def test_deflate_response(self):
+        response = self.get("/items/100/", accept_encoding="deflate")
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        content = json.loads(zlib.decompress(response.get_data()))
+        self.assertEqual(len(content), 100)
+
+    def test_small_response_is_not_compressed(self):
+        response = self.get("/items/1/")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertEqual(response.json, [{"id": 0, "text": "example"}])
+
+    def test_no_accepted_encoding(self):
+        response = self.get("/items/100/", accept_encoding="identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.vary)
+
+    def test_media_type_not_allowed(self):
+        app.config["COMPRESSION_MEDIA_TYPES"] = ["text/*"]
+        response = self.get("/items/100/")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertNotIn("Accept-Encoding", response.vary)
+
+    def test_compression_disabled(self):
+        app.config["COMPRESSION_ENABLED"] = False
+        response = self.get("/items/100/")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_streaming_response(self):
+        with app.test_client() as client:
+            response = client.get(
+                "/stream/", headers={"Accept-Encoding": "gzip"}, buffered=False
+            )
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            chunks = []
+            for chunk in response.response:
+                # Each chunk can be decoded as soon as it is received.
+                chunks.append(decompressor.decompress(chunk))
+                self.assertEqual(decompressor.unconsumed_tail, b"")
+            response.close()
+        self.assertGreater(len([chunk for chunk in chunks if chunk]), 1)
+        self.assertEqual(chunks[0][:1], b"[")
+        self.assertEqual(len(json.loads(b"".join(chunks))), 100)
+
+
+class CompressorTests(unittest.TestCase):
+    data = b'{"example": "content"}' * 100
+
+    def check_compressor(self, compressor, decompress):
+        self.assertEqual(decompress(compressor.compress(self.data)), self.data)
+        chunks = compressor.iter_compress([self.data[:100], b"", self.data[100:]])
+        self.assertEqual(decompress(b"".join(chunks)), self.data)
+
+    def test_gzip(self):
+        self.check_compressor(compression.GzipCompressor(), gzip.decompress)
+
+    def test_deflate(self):
+        self.check_compressor(compression.DeflateCompressor(), zlib.decompress)
+
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        self.check_compressor(compression.BrotliCompressor(), brotli.decompress)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        def decompress(data):
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+        self.check_compressor(compression.ZstdCompressor(), decompress)
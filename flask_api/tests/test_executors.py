@@ -0,0 +1,121 @@
+import time
+import unittest
+
+from flask_api import FlaskAPI, renderers, status
+from flask_api.decorators import set_renderers
+from flask_api.executors import RenderExecutor, count_items
+
+
+class SlowJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, media_type, **options):
+        time.sleep(0.2)
+        return super().render(data, media_type, **options)
+
+
+class CountItemsTests(unittest.TestCase):
+    def test_count_nested_values(self):
+        data = {"a": [1, 2, 3], "b": {"c": 4}}
+        self.assertEqual(count_items(data, 100), 6)
+
+    def test_count_stops_at_limit(self):
+        data = [list(range(100)) for _ in range(100)]
+        self.assertLessEqual(count_items(data, 10), 110)
+        self.assertGreater(count_items(data, 10), 10)
+
+    def test_count_scalar(self):
+        self.assertEqual(count_items("example", 10), 0)
+
+
+class RenderExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.app.config["RENDER_EXECUTOR"] = "thread"
+        self.app.config["RENDER_OFFLOAD_THRESHOLD"] = 5
+
+        @self.app.route("/items/<int:count>/")
+        def items(count):
+            return list(range(count))
+
+        @self.app.route("/slow/")
+        @set_renderers(SlowJSONRenderer)
+        def slow():
+            return list(range(10))
+
+    def tearDown(self):
+        executor = self.app.extensions.get("flask_api.render_executor")
+        if executor is not None:
+            executor.shutdown()
+
+    def get_stats(self):
+        return self.app.extensions["flask_api.render_executor"].stats()
+
+    def test_large_payload_is_offloaded(self):
+        with self.app.test_client() as client:
+            response = client.get("/items/10/")
+        self.assertEqual(response.json, list(range(10)))
+        stats = self.get_stats()
+        self.assertEqual(stats["submitted"], 1)
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_small_payload_is_rendered_inline(self):
+        with self.app.test_client() as client:
+            response = client.get("/items/3/")
+        self.assertEqual(response.json, [0, 1, 2])
+        self.assertEqual(self.get_stats()["submitted"], 0)
+
+    def test_browsable_api_in_thread(self):
+        with self.app.test_client() as client:
+            response = client.get("/items/10/", headers={"Accept": "text/html"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"<html", response.get_data())
+        self.assertEqual(self.get_stats()["completed"], 1)
+
+    def test_process_executor(self):
+        self.app.config["RENDER_EXECUTOR"] = "process"
+        self.app.config["RENDER_EXECUTOR_WORKERS"] = 1
+        with self.app.test_client() as client:
+            response = client.get("/items/10/")
+            self.assertEqual(response.json, list(range(10)))
+            self.assertEqual(self.get_stats()["completed"], 1)
+
+            # The browsable API needs the request, so it is rendered inline.
+            response = client.get("/items/10/", headers={"Accept": "text/html"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(self.get_stats()["inline"], 1)
+
+    def test_timeout_falls_back_to_inline(self):
+        self.app.config["RENDER_TIMEOUT"] = 0.01
+        with self.app.test_client() as client:
+            response = client.get("/slow/")
+        self.assertEqual(response.json, list(range(10)))
+        stats = self.get_stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["fallbacks"], 1)
+
+    def test_timeout_error(self):
+        self.app.config["RENDER_TIMEOUT"] = 0.01
+        self.app.config["RENDER_FALLBACK"] = "error"
+        with self.app.test_client() as client:
+            response = client.get("/slow/")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            response.json, {"message": "Rendering the response timed out."}
+        )
+
+    def test_executor_is_replaced_when_settings_change(self):
+        with self.app.test_client() as client:
+            client.get("/items/10/")
+            executor = self.app.extensions["flask_api.render_executor"]
+            self.app.config["RENDER_EXECUTOR_WORKERS"] = 2
+            client.get("/items/10/")
+        self.assertIsNot(self.app.extensions["flask_api.render_executor"], executor)
+        self.assertEqual(self.get_stats()["max_workers"], 2)
+
+    def test_stats(self):
+        executor = RenderExecutor("thread", max_workers=4)
+        stats = executor.stats()
+        executor.shutdown()
+        self.assertEqual(stats["kind"], "thread")
+        self.assertEqual(stats["max_workers"], 4)
+        self.assertEqual(stats["utilization"], 0)
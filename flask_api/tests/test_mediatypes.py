@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from flask_api.mediatypes import MediaType, parse_accept_header
@@ -52,6 +53,23 @@ class MediaTypeParsingTests(unittest.TestCase):
         self.assertEqual(media.params, {})
         self.assertEqual(media.precedence, 0)
 
+    def test_media_type_is_immutable(self):
+        media = MediaType("application/json; indent=4")
+        with self.assertRaises(AttributeError):
+            media.sub_type = "xml"
+        with self.assertRaises(TypeError):
+            media.params["indent"] = "8"
+        self.assertFalse(hasattr(media, "__dict__"))
+
+    def test_media_type_parse_is_cached(self):
+        media = MediaType.parse("application/json; indent=4")
+        self.assertIs(MediaType.parse("application/json; indent=4"), media)
+        self.assertEqual(media, MediaType("application/json; indent=4"))
+
+    def test_media_type_pickle(self):
+        media = MediaType("application/json; version=1.0")
+        self.assertEqual(pickle.loads(pickle.dumps(media)), media)
+
 
 class MediaTypeMatchingTests(unittest.TestCase):
     def test_media_type_includes_params(self):
@@ -0,0 +1,125 @@
+import unittest
+
+from flask_api import FlaskAPI, renderers
+from flask_api.decorators import set_renderers
+from flask_api.memo import RenderMemo
+from flask_api.response import FrozenPayload
+
+
+class CountingJSONRenderer(renderers.JSONRenderer):
+    memoizable = True
+    calls = 0
+
+    def render(self, data, media_type, **options):
+        CountingJSONRenderer.calls += 1
+        return super().render(data, media_type, **options)
+
+
+class UnmemoizedJSONRenderer(CountingJSONRenderer):
+    # A subclass does not inherit `memoizable`.
+    pass
+
+
+class RenderMemoTests(unittest.TestCase):
+    def test_entry_holds_data(self):
+        memo = RenderMemo(max_size=100)
+        data = {"example": "content"}
+        memo.set("key", data, b"content")
+        self.assertEqual(memo.get("key", data), b"content")
+        # An equal object with the same key is not the memoized data.
+        self.assertIsNone(memo.get("key", dict(data)))
+
+    def test_eviction_by_size(self):
+        memo = RenderMemo(max_size=10)
+        data = []
+        memo.set("a", data, b"x" * 6)
+        memo.set("b", data, b"x" * 6)
+        self.assertIsNone(memo.get("a", data))
+        self.assertEqual(memo.get("b", data), b"x" * 6)
+
+        # Content larger than the memo is not stored.
+        memo.set("c", data, b"x" * 11)
+        self.assertIsNone(memo.get("c", data))
+        self.assertEqual(memo.stats()["size"], 6)
+        self.assertEqual(memo.stats()["evictions"], 1)
+
+
+class FrozenPayloadTests(unittest.TestCase):
+    def setUp(self):
+        CountingJSONRenderer.calls = 0
+        self.app = FlaskAPI(__name__)
+        self.data = {"notes": ["example"]}
+        self.version = 1
+
+        @self.app.route("/frozen/")
+        @set_renderers(CountingJSONRenderer)
+        def frozen():
+            return FrozenPayload(self.data)
+
+        @self.app.route("/versioned/")
+        @set_renderers(CountingJSONRenderer)
+        def versioned():
+            return FrozenPayload(self.data, version=lambda: self.version)
+
+        @self.app.route("/unmemoized/")
+        @set_renderers(UnmemoizedJSONRenderer)
+        def unmemoized():
+            return FrozenPayload(self.data), 201
+
+    def get(self, url, **headers):
+        with self.app.test_client() as client:
+            return client.get(url, headers=headers)
+
+    def test_content_is_memoized(self):
+        self.assertEqual(self.get("/frozen/").json, self.data)
+        response = self.get("/frozen/")
+        self.assertEqual(response.json, self.data)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(CountingJSONRenderer.calls, 1)
+        stats = self.app.extensions["flask_api.render_memo"].stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_memo_is_keyed_by_media_type(self):
+        self.app.add_url_rule(
+            "/formats/",
+            "formats",
+            set_renderers(renderers.JSONRenderer, renderers.NDJSONRenderer)(
+                lambda: FrozenPayload(self.data)
+            ),
+        )
+        self.get("/formats/")
+        response = self.get("/formats/", Accept="application/x-ndjson")
+        self.assertEqual(response.get_data(), b'{"notes": ["example"]}\n')
+        self.assertEqual(self.get("/formats/").json, self.data)
+        stats = self.app.extensions["flask_api.render_memo"].stats()
+        self.assertEqual((stats["hits"], stats["entries"]), (1, 2))
+
+    def test_version(self):
+        self.get("/versioned/")
+        self.data["notes"].append("another")
+        self.assertEqual(len(self.get("/versioned/").json["notes"]), 1)
+        self.version = 2
+        self.assertEqual(len(self.get("/versioned/").json["notes"]), 2)
+        self.assertEqual(CountingJSONRenderer.calls, 2)
+
+    def test_renderer_not_memoizable(self):
+        response = self.get("/unmemoized/")
+        self.get("/unmemoized/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json, self.data)
+        self.assertEqual(CountingJSONRenderer.calls, 2)
+
+    def test_memo_disabled(self):
+        self.app.config["RENDER_MEMO_MAX_SIZE"] = 0
+        self.get("/frozen/")
+        self.get("/frozen/")
+        self.assertEqual(CountingJSONRenderer.calls, 2)
+        self.assertNotIn("flask_api.render_memo", self.app.extensions)
+
+    def test_browsable_api(self):
+        self.app.add_url_rule(
+            "/browsable/", "browsable", lambda: FrozenPayload(self.data)
+        )
+        response = self.get("/browsable/", Accept="text/html")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"example", response.get_data())
@@ -0,0 +1,144 @@
+import gzip
+import threading
+import unittest
+
+from flask import request
+
+from flask_api import FlaskAPI
+from flask_api.metrics import MetricsRegistry, format_labels
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_counters_are_combined_across_threads(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("example_total", "Example.", ("name",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc("b", amount=2)
+
+        values = registry.collect()
+        self.assertEqual(values[("example_total", ("a",))], 4000)
+        self.assertEqual(values[("example_total", ("b",))], 2)
+        # The shards of the exited threads have been retired.
+        self.assertEqual(len(registry._shards), 1)
+        self.assertEqual(registry.collect(), values)
+
+    def test_histogram_exposition(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("size_bytes", "Sizes.", buckets=(10, 100))
+        histogram.observe(5)
+        histogram.observe(50)
+        histogram.observe(500)
+        self.assertEqual(
+            registry.exposition(),
+            "# HELP size_bytes Sizes.\n"
+            "# TYPE size_bytes histogram\n"
+            'size_bytes_bucket{le="10.0"} 1\n'
+            'size_bytes_bucket{le="100.0"} 2\n'
+            'size_bytes_bucket{le="+Inf"} 3\n'
+            "size_bytes_sum 555.0\n"
+            "size_bytes_count 3\n",
+        )
+
+    def test_label_escaping(self):
+        labels = (("path", 'a\\b"c\nd'),)
+        self.assertEqual(format_labels(labels), '{path="a\\\\b\\"c\\nd"}')
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.app.config["METRICS_ENABLED"] = True
+
+        @self.app.route("/items/", methods=["GET", "POST"])
+        def items():
+            return {"data": request.data}
+
+    def get_metrics(self):
+        with self.app.test_client() as client:
+            response = client.get("/flask-api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        return response.get_data(as_text=True)
+
+    def test_metrics(self):
+        with self.app.test_client() as client:
+            client.post("/items/", json={"example": 1})
+            client.get("/items/", headers={"Accept": "image/png"})
+            client.post("/items/", data="{", content_type="application/json")
+            client.post("/items/", data="x", content_type="image/png")
+        metrics = self.get_metrics()
+
+        self.assertIn(
+            'flask_api_requests_total{endpoint="items",method="POST",status="200"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'flask_api_requests_total{endpoint="items",method="GET",status="406"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'flask_api_renderer_selected_total{endpoint="items",'
+            'renderer="JSONRenderer"} 4',
+            metrics,
+        )
+        self.assertIn(
+            'flask_api_parser_selected_total{endpoint="items",parser="JSONParser"} 2',
+            metrics,
+        )
+        for exception in ("NotAcceptable", "ParseError", "UnsupportedMediaType"):
+            self.assertIn(
+                'flask_api_exceptions_total{endpoint="items",exception="%s"} 1'
+                % exception,
+                metrics,
+            )
+        self.assertIn('flask_api_request_size_bytes_count{endpoint="items"} 3', metrics)
+        self.assertIn('flask_api_response_size_bytes_bucket{endpoint="items"', metrics)
+
+    def test_compressed_request_size(self):
+        body = gzip.compress(b'{"example": "' + b"x" * 500 + b'"}')
+        with self.app.test_client() as client:
+            client.post(
+                "/items/",
+                data=body,
+                content_type="application/json",
+                headers={"Content-Encoding": "gzip"},
+            )
+        self.assertIn(
+            'flask_api_request_size_bytes_sum{endpoint="items"} %r' % float(len(body)),
+            self.get_metrics(),
+        )
+
+    def test_timings_are_exported(self):
+        self.app.config["TIMING_ENABLED"] = True
+        with self.app.test_client() as client:
+            client.get("/items/")
+        metrics = self.get_metrics()
+        self.assertIn("# TYPE flask_api_request_phase_seconds histogram", metrics)
+        self.assertIn(
+            'flask_api_request_phase_seconds_count{endpoint="items",phase="view"} 1',
+            metrics,
+        )
+
+    def test_extension_stats_are_exported(self):
+        self.app.config["RENDER_EXECUTOR"] = "thread"
+        self.app.config["RENDER_OFFLOAD_THRESHOLD"] = 0
+        with self.app.test_client() as client:
+            client.get("/items/")
+        self.assertIn("flask_api_render_executor_completed 1", self.get_metrics())
+
+    def test_disabled(self):
+        self.app.config["METRICS_ENABLED"] = False
+        with self.app.test_client() as client:
+            client.get("/items/")
+            response = client.get("/flask-api/metrics")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("flask_api.metrics", self.app.extensions)
@@ -2,6 +2,7 @@ import unittest
 
 import flask_api
 from flask_api import exceptions
+from flask_api.mediatypes import _parse_cached
 from flask_api.negotiation import BaseNegotiation, DefaultNegotiation
 
 app = flask_api.FlaskAPI(__name__)
@@ -75,6 +76,17 @@ class TestParserNegotiation(unittest.TestCase):
             self.assertEqual(renderer, URLEncodedForm)
             self.assertEqual(str(media_type), "application/x-www-form-urlencoded")
 
+    def test_select_parser_does_not_cache_content_type(self):
+        negotiation = DefaultNegotiation()
+        parsers = [JSON, URLEncodedForm]
+        sizes = []
+        for boundary in ("first", "second"):
+            headers = {"Content-Type": "application/json; boundary=%s" % boundary}
+            with app.test_request_context(headers=headers):
+                negotiation.select_parser(parsers)
+            sizes.append(_parse_cached.cache_info().currsize)
+        self.assertEqual(sizes[1], sizes[0])
+
     def test_select_parser_failed(self):
         negotiation = DefaultNegotiation()
         parsers = [JSON, URLEncodedForm]
@@ -92,3 +104,36 @@ class TestParserNegotiation(unittest.TestCase):
             '`select_parser()` method must be implemented for class "BaseNegotiation"'
         )
         self.assertEqual(msg, expected)
+
+
+class TestRendererNegotiationCache(unittest.TestCase):
+    def setUp(self):
+        DefaultNegotiation.renderer_cache_clear()
+
+    def test_repeated_accept_header_is_cached(self):
+        negotiation = DefaultNegotiation()
+        renderers = [JSON, HTML]
+        headers = {"Accept": "application/html"}
+        for _ in range(3):
+            with app.test_request_context(headers=headers):
+                renderer, media_type = negotiation.select_renderer(renderers)
+                self.assertEqual(renderer, HTML)
+        info = DefaultNegotiation.renderer_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_cache_is_keyed_by_renderers(self):
+        negotiation = DefaultNegotiation()
+        with app.test_request_context(headers={"Accept": "*/*"}):
+            renderer, media_type = negotiation.select_renderer([JSON, HTML])
+            self.assertEqual(renderer, JSON)
+            renderer, media_type = negotiation.select_renderer([HTML, JSON])
+            self.assertEqual(renderer, HTML)
+
+    def test_not_acceptable_is_cached(self):
+        negotiation = DefaultNegotiation()
+        headers = {"Accept": "application/xml"}
+        for _ in range(2):
+            with app.test_request_context(headers=headers):
+                with self.assertRaises(exceptions.NotAcceptable):
+                    negotiation.select_renderer([JSON, HTML])
+        self.assertEqual(DefaultNegotiation.renderer_cache_info().hits, 1)
@@ -3,9 +3,12 @@ import json
 import unittest
 
 from flask import request
+from flask.views import MethodView
 
 from flask_api import FlaskAPI, exceptions, mediatypes, parsers, status
+from flask_api.compat import cbor2, msgpack, orjson
 from flask_api.decorators import set_parsers
+from flask_api.helpers import url_decode_stream
 
 app = FlaskAPI(__name__)
 
@@ -31,11 +34,158 @@ class ParserTests(unittest.TestCase):
         data = parser.parse(stream, "application/json")
         self.assertEqual(data, {"key": 1, "other": "two"})
 
+    def test_invalid_utf8_json(self):
+        parser = parsers.JSONParser()
+        stream = io.BytesIO(b'{"key": "\xff"}')
+        with self.assertRaises(exceptions.ParseError):
+            parser.parse(stream, mediatypes.MediaType("application/json"))
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_valid_json_with_orjson_backend(self):
+        app = FlaskAPI(__name__)
+        app.config["DEFAULT_JSON_BACKEND"] = "flask_api.backends.OrjsonBackend"
+        parser = parsers.JSONParser()
+        with app.app_context():
+            data = parser.parse(io.BytesIO(b'{"key": 1}'), "application/json")
+            self.assertEqual(data, {"key": 1})
+            with self.assertRaises(exceptions.ParseError):
+                parser.parse(io.BytesIO(b'{key: 1}'), "application/json")
+
+    def test_iter_parse_json_array(self):
+        parser = parsers.JSONParser()
+        parser.chunk_size = 4
+        stream = io.BytesIO(b'[1, {"a": ["x]\\"", 2]}, "s,]", []]')
+        items = list(parser.iter_parse(stream, "application/json"))
+        self.assertEqual(items, [1, {"a": ['x]"', 2]}, "s,]", []])
+
+    def test_iter_parse_empty_array(self):
+        parser = parsers.JSONParser()
+        stream = io.BytesIO(b" [ ] ")
+        self.assertEqual(list(parser.iter_parse(stream, "application/json")), [])
+
+    def test_iter_parse_invalid_arrays(self):
+        parser = parsers.JSONParser()
+        for body in [b"[1, 2", b"[1,]", b"[1] 2", b"[1}"]:
+            with self.assertRaises(exceptions.ParseError):
+                list(parser.iter_parse(io.BytesIO(body), "application/json"))
+
+    def test_json_max_body_size(self):
+        app = FlaskAPI(__name__)
+        app.config["JSON_MAX_BODY_SIZE"] = 8
+        parser = parsers.JSONParser()
+        parser.chunk_size = 4
+        with app.app_context():
+            body = b'{"key": "value"}'
+            with self.assertRaises(exceptions.RequestEntityTooLarge):
+                parser.parse(io.BytesIO(body), "application/json")
+            with self.assertRaises(exceptions.RequestEntityTooLarge):
+                parser.parse(io.BytesIO(b"{}"), "application/json", content_length=16)
+            with self.assertRaises(exceptions.RequestEntityTooLarge):
+                list(parser.iter_parse(io.BytesIO(b"[" + body + b"]"), "application/json"))
+
+    def test_json_max_depth(self):
+        app = FlaskAPI(__name__)
+        app.config["JSON_MAX_DEPTH"] = 2
+        parser = parsers.JSONParser()
+        with app.app_context():
+            data = parser.parse(io.BytesIO(b'[{"a": "[[["}]'), "application/json")
+            self.assertEqual(data, [{"a": "[[["}])
+            with self.assertRaises(exceptions.ParseError):
+                parser.parse(io.BytesIO(b'[{"a": []}]'), "application/json")
+            with self.assertRaises(exceptions.ParseError):
+                list(parser.iter_parse(io.BytesIO(b"[1, [[2]]]"), "application/json"))
+
+    def test_parse_ndjson(self):
+        parser = parsers.NDJSONParser()
+        parser.chunk_size = 5
+        stream = io.BytesIO(b'{"key": 1}\n\n{"key": 2}\r\n[3]')
+        data = parser.parse(stream, "application/x-ndjson")
+        self.assertEqual(data, [{"key": 1}, {"key": 2}, [3]])
+
+    def test_iter_parse_ndjson_is_lazy(self):
+        parser = parsers.NDJSONParser()
+        parser.chunk_size = 4
+        stream = io.BytesIO(b'{"key": 1}\n{"key": 2}\n')
+        items = parser.iter_parse(stream, "application/x-ndjson")
+        self.assertEqual(next(items), {"key": 1})
+        self.assertLess(stream.tell(), len(stream.getvalue()))
+        self.assertEqual(list(items), [{"key": 2}])
+
+    def test_invalid_ndjson(self):
+        parser = parsers.NDJSONParser()
+        stream = io.BytesIO(b'{"key": 1}\n{key: 2}\n')
+        with self.assertRaises(exceptions.ParseError):
+            parser.parse(stream, "application/x-ndjson")
+
+    def test_accessing_ndjson(self):
+        with app.test_client() as client:
+            data = b'{"example": 1}\n{"example": 2}\n'
+            response = client.post("/", data=data, content_type="application/x-ndjson")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = json.loads(response.get_data().decode("utf8"))
+            self.assertEqual(data["data"], [{"example": 1}, {"example": 2}])
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_accessing_msgpack(self):
+        with app.test_client() as client:
+            data = msgpack.packb({"example": [1, "two"]})
+            response = client.post("/", data=data, content_type="application/msgpack")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = json.loads(response.get_data().decode("utf8"))
+            self.assertEqual(data["data"], {"example": [1, "two"]})
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_invalid_msgpack(self):
+        parser = parsers.MsgPackParser()
+        with self.assertRaises(exceptions.ParseError):
+            parser.parse(io.BytesIO(b"\xc1"), "application/msgpack")
+
+    @unittest.skipIf(cbor2 is None, "cbor2 not installed")
+    def test_accessing_cbor(self):
+        with app.test_client() as client:
+            data = cbor2.dumps({"example": [1, "two"]})
+            response = client.post("/", data=data, content_type="application/cbor")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = json.loads(response.get_data().decode("utf8"))
+            self.assertEqual(data["data"], {"example": [1, "two"]})
+
+    @unittest.skipIf(cbor2 is None, "cbor2 not installed")
+    def test_invalid_cbor(self):
+        parser = parsers.CBORParser()
+        with self.assertRaises(exceptions.ParseError):
+            parser.parse(io.BytesIO(b"\xff\xff"), "application/cbor")
+
     def test_parse_urlencoded(self):
         parser = parsers.URLEncodedParser()
         stream = io.BytesIO(b'next=http://www.example.com&test1=val1&test%5c=val%2f')
         data = parser.parse(stream, "application/x-www-form-urlencoded")
-        self.assertEqual(data, {"next": "http://www.example.com", "test1": "val1", "test\\": "val/"})
+        self.assertEqual(data.to_dict(), {"next": "http://www.example.com", "test1": "val1", "test\\": "val/"})
+
+    def test_parse_urlencoded_repeated_keys(self):
+        parser = parsers.URLEncodedParser()
+        stream = io.BytesIO(b"a=1&b=two+words&a=2&&c")
+        media_type = mediatypes.MediaType("application/x-www-form-urlencoded")
+        data = parser.parse(stream, media_type)
+        self.assertEqual(data.getlist("a"), ["1", "2"])
+        self.assertEqual(data["b"], "two words")
+        self.assertEqual(data["c"], "")
+
+    def test_parse_urlencoded_charset(self):
+        parser = parsers.URLEncodedParser()
+        stream = io.BytesIO(b"name=caf%E9")
+        media_type = mediatypes.MediaType("application/x-www-form-urlencoded; charset=latin-1")
+        self.assertEqual(parser.parse(stream, media_type)["name"], "caf\xe9")
+
+    def test_url_decode_stream_in_chunks(self):
+        stream = io.BytesIO(b"first=" + b"x" * 10 + b"&second=2")
+        data = url_decode_stream(stream, chunk_size=3)
+        self.assertEqual(data.to_dict(), {"first": "x" * 10, "second": "2"})
+
+    def test_url_decode_stream_limits(self):
+        with self.assertRaises(exceptions.RequestEntityTooLarge):
+            url_decode_stream(io.BytesIO(b"a=1&b=2&c=3"), max_fields=2)
+        with self.assertRaises(exceptions.RequestEntityTooLarge):
+            url_decode_stream(io.BytesIO(b"a=" + b"x" * 10), max_field_size=8, chunk_size=4)
 
     def test_invalid_json(self):
         parser = parsers.JSONParser()
@@ -114,6 +264,60 @@ class ParserTests(unittest.TestCase):
             self.assertEqual(data, expected)
 
 
+class MultiPartParserTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.app.config["PROPAGATE_EXCEPTIONS"] = True
+        self.uploads = {}
+
+        @self.app.route("/", methods=["POST"])
+        def upload():
+            self.uploads.update(request.files)
+            return {"form": request.form}
+
+    def _post(self, data):
+        with self.app.test_client() as client:
+            return client.post("/", data=data, content_type="multipart/form-data")
+
+    def test_large_uploads_are_spooled_to_disk(self):
+        self.app.config["MULTIPART_MEMORY_THRESHOLD"] = 16
+        data = {
+            "small": (io.BytesIO(b"small"), "small.txt"),
+            "large": (io.BytesIO(b"x" * 1024), "large.txt"),
+        }
+        response = self._post(data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(self.uploads["small"].stream._rolled)
+        self.assertTrue(self.uploads["large"].stream._rolled)
+        self.uploads["large"].stream.seek(0)
+        self.assertEqual(self.uploads["large"].read(), b"x" * 1024)
+
+    def test_max_parts(self):
+        self.app.config["MULTIPART_MAX_PARTS"] = 2
+        data = {"a": "1", "b": "2", "c": "3"}
+        response = self._post(data)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_max_size(self):
+        self.app.config["MULTIPART_MAX_SIZE"] = 64
+        data = {"upload": (io.BytesIO(b"x" * 1024), "large.txt")}
+        response = self._post(data)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_custom_stream_factory(self):
+        streams = []
+
+        def stream_factory(total_content_length, content_type, filename, content_length=None):
+            streams.append(io.BytesIO())
+            return streams[-1]
+
+        self.app.config["MULTIPART_STREAM_FACTORY"] = stream_factory
+        data = {"upload": (io.BytesIO(b"file contents"), "name.txt")}
+        response = self._post(data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([stream.getvalue() for stream in streams], [b"file contents"])
+
+
 class OverrideParserSettings(unittest.TestCase):
     def setUp(self):
         class CustomParser1(parsers.BaseParser):
@@ -182,3 +386,18 @@ class OverrideParserSettings(unittest.TestCase):
                 "data": "custom parser 2",
             }
             self.assertEqual(data, expected)
+
+    def test_overridden_parsers_on_method_view(self):
+        class ItemView(MethodView):
+            @set_parsers(parsers.URLEncodedParser)
+            def post(self):
+                return {"data": request.data}
+
+        self.app.add_url_rule("/method_view/", view_func=ItemView.as_view("items"))
+        with self.app.test_client() as client:
+            response = client.post("/method_view/", json={"example": "example"})
+            self.assertEqual(
+                response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+            response = client.post("/method_view/", data={"example": "example"})
+            self.assertEqual(response.json, {"data": {"example": "example"}})
@@ -4,8 +4,10 @@ from datetime import datetime
 from flask.json.provider import DefaultJSONProvider
 
 from flask_api import FlaskAPI, renderers, status
+from flask_api.compat import cbor2, msgpack, orjson
 from flask_api.decorators import set_renderers
 from flask_api.mediatypes import MediaType
+from flask_api.response import StreamingList
 
 
 class RendererTests(unittest.TestCase):
@@ -53,6 +55,95 @@ class RendererTests(unittest.TestCase):
             content = renderer.render(date, MediaType("application/json"))
         self.assertEqual(content, '"{}"'.format(date.isoformat()))
 
+    def test_render_json_without_app_context(self):
+        renderer = renderers.JSONRenderer()
+        content = renderer.render({"b": 1, "a": 2}, MediaType("application/json"))
+        self.assertEqual(content, '{"a": 2, "b": 1}')
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_render_json_with_orjson_backend(self):
+        app = self._make_app()
+        app.config["DEFAULT_JSON_BACKEND"] = "flask_api.backends.OrjsonBackend"
+        renderer = renderers.JSONRenderer()
+        date = datetime(2017, 10, 5, 15, 22)
+        with app.app_context():
+            content = renderer.render(
+                {"b": date, "a": "I <3 Python"}, MediaType("application/json")
+            )
+        expected = b'{"a":"I <3 Python","b":"Thu, 05 Oct 2017 15:22:00 GMT"}'
+        self.assertEqual(content, expected)
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_render_browsable_with_orjson_backend(self):
+        app = self._make_app()
+        app.config["DEFAULT_JSON_BACKEND"] = "flask_api.backends.OrjsonBackend"
+        with app.test_client() as client:
+            response = client.get("/_love")
+            self.assertEqual(response.get_data(), b'{"test":"I <3 Python"}')
+            response = client.get("/_love", headers={"Accept": "text/html"})
+            self.assertIn("I &lt;3 Python", response.get_data(as_text=True))
+
+    def test_render_ndjson(self):
+        renderer = renderers.NDJSONRenderer()
+        media_type = MediaType("application/x-ndjson")
+        content = renderer.render([{"a": 1}, {"b": 2}], media_type)
+        self.assertEqual(content, b'{"a": 1}\n{"b": 2}\n')
+        content = renderer.render({"a": 1}, media_type)
+        self.assertEqual(content, b'{"a": 1}\n')
+
+    def test_render_ndjson_stream(self):
+        app = FlaskAPI(__name__)
+
+        @app.route("/export/")
+        def export():
+            return StreamingList({"id": idx} for idx in range(3))
+
+        with app.test_client() as client:
+            headers = {"Accept": "application/x-ndjson"}
+            response = client.get("/export/", headers=headers)
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.content_type, "application/x-ndjson")
+            expected = b'{"id": 0}\n{"id": 1}\n{"id": 2}\n'
+            self.assertEqual(response.get_data(), expected)
+
+    def test_render_html_stream(self):
+        app = FlaskAPI(__name__)
+
+        @app.route("/page/")
+        @set_renderers(renderers.HTMLRenderer)
+        def page():
+            return StreamingList(["<p>", "Hello", "</p>"])
+
+        with app.test_client() as client:
+            response = client.get("/page/")
+            self.assertEqual(response.content_type, "text/html")
+            self.assertEqual(response.get_data(), b"<p>Hello</p>")
+
+    @unittest.skipIf(msgpack is None, "msgpack not installed")
+    def test_render_msgpack(self):
+        app = self._make_app()
+        with app.test_client() as client:
+            response = client.get("/_love", headers={"Accept": "application/msgpack"})
+            self.assertEqual(response.content_type, "application/msgpack")
+            data = msgpack.unpackb(response.get_data())
+            self.assertEqual(data, {"test": "I <3 Python"})
+
+    @unittest.skipIf(cbor2 is None, "cbor2 not installed")
+    def test_render_cbor(self):
+        app = self._make_app()
+        with app.test_client() as client:
+            response = client.get("/_love", headers={"Accept": "application/cbor"})
+            self.assertEqual(response.content_type, "application/cbor")
+            data = cbor2.loads(response.get_data())
+            self.assertEqual(data, {"test": "I <3 Python"})
+
+    @unittest.skipIf(cbor2 is None, "cbor2 not installed")
+    def test_render_cbor_with_datetime(self):
+        renderer = renderers.CBORRenderer()
+        date = datetime(2017, 10, 5, 15, 22)
+        content = renderer.render({"date": date}, MediaType("application/cbor"))
+        self.assertEqual(cbor2.loads(content)["date"].replace(tzinfo=None), date)
+
     def test_render_browsable_encoding(self):
         app = FlaskAPI(__name__)
 
@@ -1,10 +1,25 @@
+import copy
+import gzip
 import io
+import json
+import sys
+import threading
 import unittest
+import zlib
 
 from flask import request
+from werkzeug.datastructures import MultiDict
 
 import flask_api
-from flask_api import exceptions
+from flask_api import exceptions, parsers
+from flask_api.compat import zstandard
+from flask_api.decorators import set_parsers
+from flask_api.response import APIResponse
+
+try:
+    import asgiref
+except ImportError:
+    asgiref = None
 
 app = flask_api.FlaskAPI(__name__)
 
@@ -26,7 +41,7 @@ class MediaTypeParsingTests(unittest.TestCase):
             "content_type": "application/x-www-form-urlencoded",
         }
         with app.test_request_context(**kwargs):
-            self.assertEqual(request.data, {"next": "http://www.example.com", "test1": "val1", "test\\": "val/"})
+            self.assertEqual(request.data.to_dict(), {"next": "http://www.example.com", "test1": "val1", "test\\": "val/"})
 
     def test_invalid_content_type_request(self):
         kwargs = {
@@ -58,3 +73,289 @@ class MediaTypeParsingTests(unittest.TestCase):
         """
         with app.test_request_context(method="GET", path="/?a=b"):
             self.assertEqual(request.full_path, "/?a=b")
+
+
+class ParserInstanceTests(unittest.TestCase):
+    def test_stateless_parsers_are_shared(self):
+        with app.test_request_context(method="PUT"):
+            parsers = request.get_parsers()
+        with app.test_request_context(method="PUT"):
+            self.assertEqual(
+                [id(parser) for parser in request.get_parsers()],
+                [id(parser) for parser in parsers],
+            )
+
+    def test_stateful_parsers_are_not_shared(self):
+        class StatefulParser(parsers.BaseParser):
+            media_type = "text/plain"
+
+        with app.test_request_context(method="PUT"):
+            request.parser_classes = [StatefulParser]
+            first = request.get_parsers()[0]
+            self.assertIsNot(request.get_parsers()[0], first)
+
+    def test_subclasses_of_stateless_parsers_are_not_shared(self):
+        class StatefulJSONParser(parsers.JSONParser):
+            pass
+
+        class StatelessJSONParser(parsers.JSONParser):
+            stateless = True
+
+        with app.test_request_context(method="PUT"):
+            request.parser_classes = [StatefulJSONParser, StatelessJSONParser]
+            first = request.get_parsers()
+            second = request.get_parsers()
+            self.assertIsNot(second[0], first[0])
+            self.assertIs(second[1], first[1])
+
+
+class IterDataTests(unittest.TestCase):
+    def test_iter_json_array(self):
+        kwargs = {
+            "method": "POST",
+            "input_stream": io.BytesIO(b'[{"key": 1}, {"key": 2}]'),
+            "content_type": "application/json",
+        }
+        with app.test_request_context(**kwargs):
+            self.assertEqual(list(request.iter_data()), [{"key": 1}, {"key": 2}])
+            self.assertFalse(request.data)
+
+    def test_iter_json_object(self):
+        kwargs = {
+            "method": "POST",
+            "input_stream": io.BytesIO(b'{"key": 1}'),
+            "content_type": "application/json",
+        }
+        with app.test_request_context(**kwargs):
+            self.assertEqual(list(request.iter_data()), [{"key": 1}])
+
+    def test_iter_form_data(self):
+        kwargs = {
+            "method": "POST",
+            "input_stream": io.BytesIO(b"key=1"),
+            "content_type": "application/x-www-form-urlencoded",
+        }
+        with app.test_request_context(**kwargs):
+            self.assertEqual(list(request.iter_data()), [MultiDict({"key": "1"})])
+
+    def test_iter_no_content(self):
+        with app.test_request_context(method="POST"):
+            self.assertEqual(list(request.iter_data()), [])
+
+
+class MethodOverloadingTests(unittest.TestCase):
+    def _form_request(self, app, body):
+        return app.test_request_context(
+            method="POST",
+            input_stream=io.BytesIO(body),
+            content_type="application/x-www-form-urlencoded",
+        )
+
+    def test_method_overloading(self):
+        with self._form_request(app, b"_method=PUT&text=example"):
+            self.assertEqual(request.data["text"], "example")
+            self.assertEqual(request.method, "PUT")
+            self.assertIs(request.data, request.stream.parsed_form)
+
+    def test_percent_encoded_method_overloading(self):
+        with self._form_request(app, b"%5Fmethod=PUT&text=example"):
+            self.assertEqual(request.data["text"], "example")
+            self.assertEqual(request.method, "PUT")
+
+    def test_method_overloading_without_value(self):
+        for body in (b"text=example&_method", b"text=example&_method="):
+            with self._form_request(app, body):
+                self.assertTrue(hasattr(request.stream, "parsed_form"))
+                self.assertEqual(request.data["text"], "example")
+                self.assertEqual(request.method, "POST")
+
+    def test_content_overloading(self):
+        body = b"_content=%7B%22key%22%3A+1%7D&_content_type=application%2Fjson"
+        with self._form_request(app, body):
+            self.assertEqual(request.method, "POST")
+            self.assertEqual(request.content_type, "application/json")
+            self.assertEqual(request.data, {"key": 1})
+
+    def test_plain_form_is_not_decoded_twice(self):
+        with self._form_request(app, b"text=example&other_method%3D=1"):
+            self.assertFalse(hasattr(request.stream, "parsed_form"))
+            self.assertEqual(request.data["text"], "example")
+            self.assertEqual(request.method, "POST")
+
+    def test_method_overloading_disabled(self):
+        app = flask_api.FlaskAPI(__name__)
+        app.config["METHOD_OVERLOADING"] = False
+        with self._form_request(app, b"_method=PUT&text=example"):
+            self.assertEqual(request.data["_method"], "PUT")
+            self.assertEqual(request.method, "POST")
+
+
+class LazyParsingTests(unittest.TestCase):
+    def setUp(self):
+        self.app = flask_api.FlaskAPI(__name__)
+        self.app.config["LAZY_PARSING"] = True
+
+    def _json_request(self, body):
+        return self.app.test_request_context(
+            method="POST", input_stream=io.BytesIO(body), content_type="application/json"
+        )
+
+    def test_lazy_member_access(self):
+        with self._json_request(b'{"key": 1, "other": {"nested": "}"}, "bad": [oops]}'):
+            self.assertEqual(request.data["key"], 1)
+            self.assertEqual(request.data.get("missing"), None)
+            self.assertIn("other", request.data)
+            self.assertEqual(len(request.data), 3)
+            self.assertFalse(request.data.materialized)
+            with self.assertRaises(exceptions.ParseError):
+                request.data["bad"]
+
+    def test_lazy_data_materializes_as_dict(self):
+        with self._json_request(b'{"key": 1, "other": [2]}'):
+            self.assertEqual(request.data, {"key": 1, "other": [2]})
+            self.assertTrue(request.data.materialized)
+
+    def test_lazy_data_is_copied_with_decoded_values(self):
+        body = b'{"key": 1, "other": [2]}'
+        copy_functions = [dict, copy.copy, copy.deepcopy]
+        if sys.version_info >= (3, 9):
+            copy_functions.append(lambda data: data | {})
+        for copy_data in copy_functions:
+            with self._json_request(body):
+                data = copy_data(request.data)
+                self.assertIs(type(data), dict)
+                self.assertEqual(list(dict.values(data)), [1, [2]])
+
+    def test_lazy_data_is_json_encoded(self):
+        with self._json_request(b'{"key": 1, "other": [2]}'):
+            self.assertEqual(json.dumps(request.data), '{"key": 1, "other": [2]}')
+
+    def test_lazy_data_is_rendered(self):
+        @self.app.route("/", methods=["POST"])
+        def echo():
+            return {"data": request.data}
+
+        with self.app.test_client() as client:
+            response = client.post("/", data=b'{"key": 1}', content_type="application/json")
+            self.assertEqual(response.get_data(), b'{"data": {"key": 1}}')
+
+    def test_lazy_parsing_ndjson(self):
+        kwargs = {"method": "POST", "content_type": "application/x-ndjson"}
+        for body, data in (
+            (b'{"a": 1}\n{"b": 2}\n', [{"a": 1}, {"b": 2}]),
+            (b'{"a": 1}\n', [{"a": 1}]),
+        ):
+            with self.app.test_request_context(input_stream=io.BytesIO(body), **kwargs):
+                request.parser_classes = [parsers.NDJSONParser]
+                self.assertEqual(request.data, data)
+
+    def test_lazy_non_object(self):
+        with self._json_request(b"[1, 2]"):
+            self.assertEqual(request.data, [1, 2])
+
+
+class ThreadRecordingParser(parsers.JSONParser):
+    threads = []
+
+    def parse(self, stream, media_type, **options):
+        self.threads.append(threading.current_thread().name)
+        return super().parse(stream, media_type, **options)
+
+
+@unittest.skipIf(asgiref is None, "asgiref is not installed")
+class AsyncViewTests(unittest.TestCase):
+    def setUp(self):
+        self.app = flask_api.FlaskAPI(__name__)
+        ThreadRecordingParser.threads = []
+
+        @self.app.route("/", methods=["POST"])
+        @set_parsers(ThreadRecordingParser)
+        async def echo():
+            data = await request.parse_async()
+            thread = threading.current_thread().name
+            return await APIResponse.create_async({"data": data, "thread": thread})
+
+    def test_async_parse_and_render(self):
+        with self.app.test_client() as client:
+            response = client.post("/", json={"key": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["data"], {"key": 1})
+        self.assertEqual(ThreadRecordingParser.threads, [response.json["thread"]])
+
+    def test_large_body_is_parsed_in_thread(self):
+        self.app.config["ASYNC_PARSE_THRESHOLD"] = 8
+        with self.app.test_client() as client:
+            response = client.post("/", json={"key": "x" * 16})
+        self.assertEqual(response.json["data"], {"key": "x" * 16})
+        self.assertEqual(len(ThreadRecordingParser.threads), 1)
+        self.assertNotEqual(ThreadRecordingParser.threads[0], response.json["thread"])
+
+
+class DecompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.app = flask_api.FlaskAPI(__name__)
+
+        @self.app.route("/", methods=["POST"])
+        def echo():
+            files = {key: file.read().decode() for key, file in request.files.items()}
+            return {"data": request.data, "files": files}
+
+    def post(self, body, encoding, content_type="application/json"):
+        with self.app.test_client() as client:
+            return client.post(
+                "/",
+                data=body,
+                headers={"Content-Encoding": encoding, "Content-Type": content_type},
+            )
+
+    def test_gzip(self):
+        response = self.post(gzip.compress(b'{"key": "value"}'), "gzip")
+        self.assertEqual(response.json["data"], {"key": "value"})
+
+    def test_deflate(self):
+        response = self.post(zlib.compress(b'{"key": "value"}'), "deflate")
+        self.assertEqual(response.json["data"], {"key": "value"})
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        body = zstandard.ZstdCompressor().compress(b'{"key": "value"}')
+        response = self.post(body, "zstd")
+        self.assertEqual(response.json["data"], {"key": "value"})
+
+    def test_multipart(self):
+        body = (
+            b"--boundary\r\n"
+            b'Content-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+            b"\r\n"
+            b"example\r\n"
+            b"--boundary--\r\n"
+        )
+        response = self.post(
+            gzip.compress(body), "gzip", "multipart/form-data; boundary=boundary"
+        )
+        self.assertEqual(response.json["files"], {"upload": "example"})
+
+    def test_decompressed_size_limit(self):
+        self.app.config["REQUEST_MAX_DECOMPRESSED_SIZE"] = 1024
+        body = gzip.compress(b'{"key": "' + b"x" * 100000 + b'"}')
+        self.assertLess(len(body), 1024)
+        response = self.post(body, "gzip")
+        self.assertEqual(response.status_code, 413)
+
+    def test_unsupported_encoding(self):
+        response = self.post(b'{"key": "value"}', "compress")
+        self.assertEqual(response.status_code, 415)
+
+    def test_invalid_body(self):
+        response = self.post(b"not gzip", "gzip")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid compressed request body", response.json["message"])
+
+    def test_truncated_body(self):
+        response = self.post(gzip.compress(b'{"key": "value"}')[:-8], "gzip")
+        self.assertEqual(response.status_code, 400)
+
+    def test_decompression_disabled(self):
+        self.app.config["REQUEST_DECOMPRESSION"] = False
+        response = self.post(gzip.compress(b'{"key": "value"}'), "gzip")
+        self.assertEqual(response.status_code, 400)
@@ -1,5 +1,7 @@
 import unittest
 
+from flask_api import FlaskAPI
+from flask_api.parsers import JSONParser, URLEncodedParser
 from flask_api.settings import APISettings
 
 
@@ -18,3 +20,38 @@ class SettingsTests(unittest.TestCase):
             "'DEFAULT_PARSERS'. No module named 'foobarz'."
         )
         self.assertIn(msg, (excepted_py2, excepted_py3))
+
+    def test_resolved_settings_are_memoized(self):
+        settings = APISettings({"DEFAULT_PARSERS": ["flask_api.parsers.JSONParser"]})
+        parsers = settings.DEFAULT_PARSERS
+        self.assertIsInstance(parsers, tuple)
+        self.assertIs(settings.DEFAULT_PARSERS, parsers)
+
+    def test_replaced_config_value(self):
+        config = {"DEFAULT_PARSERS": ["flask_api.parsers.JSONParser"]}
+        settings = APISettings(config)
+        settings.DEFAULT_PARSERS
+        config["DEFAULT_PARSERS"] = ["flask_api.parsers.URLEncodedParser"]
+        self.assertEqual(settings.DEFAULT_PARSERS, (URLEncodedParser,))
+
+    def test_reload(self):
+        config = {"DEFAULT_PARSERS": ["flask_api.parsers.JSONParser"]}
+        settings = APISettings(config)
+        settings.DEFAULT_PARSERS
+        config["DEFAULT_PARSERS"].append("flask_api.parsers.URLEncodedParser")
+        self.assertEqual(settings.DEFAULT_PARSERS, (JSONParser,))
+        settings.reload()
+        self.assertEqual(settings.DEFAULT_PARSERS, (JSONParser, URLEncodedParser))
+
+    def test_validate(self):
+        settings = APISettings({"DEFAULT_RENDERERS": ["foobarz.FailedImport"]})
+        with self.assertRaises(ImportError):
+            settings.validate()
+
+    def test_validated_on_first_context(self):
+        app = FlaskAPI(__name__)
+        app.config["DEFAULT_RENDERERS"] = ["foobarz.FailedImport"]
+        with self.assertRaises(ImportError):
+            app.app_context()
+        with self.assertRaises(ImportError):
+            app.test_client().get("/")
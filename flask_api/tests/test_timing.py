@@ -0,0 +1,88 @@
+import time
+import unittest
+
+from flask import request
+
+from flask_api import FlaskAPI
+from flask_api.timing import Histogram, RequestTimings, request_timed
+
+
+class RequestTimingsTests(unittest.TestCase):
+    def test_nested_phases_are_exclusive(self):
+        timings = RequestTimings()
+
+        def view():
+            time.sleep(0.02)
+            timings.measure("parse", time.sleep, 0.05)
+
+        timings.measure("view", view)
+        self.assertGreaterEqual(timings.phases["parse"], 0.05)
+        self.assertLess(timings.phases["view"], 0.05)
+
+    def test_header(self):
+        timings = RequestTimings()
+        timings.add("parse", 0.0015)
+        timings.total = 0.002
+        self.assertEqual(timings.get_header(), "parse;dur=1.500, total;dur=2.000")
+
+
+class HistogramTests(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["counts"], [2, 1, 1])
+        self.assertEqual(snapshot["count"], 4)
+        self.assertAlmostEqual(snapshot["sum"], 2.65)
+
+
+class TimingTests(unittest.TestCase):
+    def setUp(self):
+        self.app = FlaskAPI(__name__)
+        self.app.config["TIMING_ENABLED"] = True
+
+        @self.app.route("/items/", methods=["GET", "POST"])
+        def items():
+            return {"data": request.data}
+
+    def post(self, url="/items/", **kwargs):
+        with self.app.test_client() as client:
+            return client.post(url, json={"example": 1}, **kwargs)
+
+    def test_phases(self):
+        recorded = []
+
+        def receiver(sender, timings, response):
+            recorded.append(timings)
+
+        with request_timed.connected_to(receiver, self.app):
+            response = self.post()
+        self.assertNotIn("Server-Timing", response.headers)
+        self.assertEqual(len(recorded), 1)
+        phases = recorded[0].phases
+        self.assertEqual(sorted(phases), ["negotiate", "parse", "render", "view"])
+        self.assertGreaterEqual(recorded[0].total, sum(phases.values()))
+
+    def test_server_timing_header(self):
+        self.app.config["TIMING_HEADER"] = True
+        header = self.post().headers["Server-Timing"]
+        phases = [item.split(";")[0] for item in header.split(", ")]
+        self.assertEqual(phases[-1], "total")
+        self.assertIn("parse", phases)
+
+    def test_histograms(self):
+        self.post()
+        self.post()
+        self.post("/missing/")
+        snapshot = self.app.extensions["flask_api.timings"].snapshot()
+        self.assertEqual(snapshot[("items", "total")]["count"], 2)
+        self.assertEqual(snapshot[("items", "parse")]["count"], 2)
+        self.assertEqual(snapshot[(None, "total")]["count"], 1)
+
+    def test_disabled(self):
+        self.app.config["TIMING_ENABLED"] = False
+        self.app.config["TIMING_HEADER"] = True
+        response = self.post()
+        self.assertNotIn("Server-Timing", response.headers)
+        self.assertNotIn("flask_api.timings", self.app.extensions)
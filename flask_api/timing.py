@@ -0,0 +1,160 @@
+import functools
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+from flask import current_app
+from flask.signals import Namespace
+
+from flask_api.settings import get_settings
+
+_signals = Namespace()
+
+# Sent with the app as the sender, and `timings` and `response` keyword
+# arguments, once the response to a timed request is complete.
+request_timed = _signals.signal("request-timed")
+
+_timings_lock = threading.Lock()
+
+
+def get_timing_histograms():
+    """
+    Return the current app's histograms of request timings, with the bucket
+    bounds set by `TIMING_BUCKETS`.
+    """
+    buckets = get_settings().TIMING_BUCKETS
+    extensions = current_app.extensions
+    with _timings_lock:
+        histograms = extensions.get("flask_api.timings")
+        if histograms is None or histograms.buckets != buckets:
+            histograms = TimingHistograms(buckets)
+            extensions["flask_api.timings"] = histograms
+    return histograms
+
+
+def timed(phase):
+    """
+    Decorate an `APIRequest` method, so that the time spent in it is recorded
+    as the given phase when the request is timed.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if self.timings is None:
+                return func(self, *args, **kwargs)
+            return self.timings.measure(phase, func, self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class RequestTimings:
+    """
+    The time in seconds spent in each phase of a request, measured with a
+    monotonic clock.
+
+    Phases that are measured within another phase, such as parsing the
+    request body from within the view, are excluded from the outer phase's
+    time, so that the phases do not overlap.
+    """
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.phases = {}
+        self.total = None
+        self._nested = 0.0
+
+    def measure(self, phase, func, *args, **kwargs):
+        """
+        Call `func(*args, **kwargs)`, adding the time spent to `phase`.
+        """
+        outer = self._nested
+        self._nested = 0.0
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = perf_counter() - start
+            self.add(phase, duration - self._nested)
+            self._nested = outer + duration
+
+    def add(self, phase, duration):
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def finish(self):
+        self.total = perf_counter() - self.start
+
+    def get_header(self):
+        """
+        Return the timings as a `Server-Timing` header value, in milliseconds.
+        """
+        items = list(self.phases.items())
+        if self.total is not None:
+            items.append(("total", self.total))
+        return ", ".join(
+            "%s;dur=%.3f" % (phase, duration * 1000) for phase, duration in items
+        )
+
+
+class Histogram:
+    """
+    Counts observations in buckets with the given upper bounds, and in a
+    final bucket for values above the last bound.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        return {
+            "buckets": self.buckets,
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class TimingHistograms:
+    """
+    Histograms of the time spent in each phase of a request, by endpoint.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, timings):
+        items = list(timings.phases.items())
+        if timings.total is not None:
+            items.append(("total", timings.total))
+        with self._lock:
+            for phase, duration in items:
+                histogram = self._histograms.get((endpoint, phase))
+                if histogram is None:
+                    histogram = Histogram(self.buckets)
+                    self._histograms[(endpoint, phase)] = histogram
+                histogram.observe(duration)
+
+    def snapshot(self):
+        """
+        Return a dict of histogram snapshots, keyed by (endpoint, phase).
+        """
+        with self._lock:
+            return {
+                key: histogram.snapshot() for key, histogram in self._histograms.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()